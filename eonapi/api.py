@@ -1,19 +1,100 @@
 """Eon Next API client."""
 
+import asyncio
+
 import httpx
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Optional
+
+from dateutil.parser import isoparse
+
+
+# Format for dates sent to the API (timezone suffix required)
+API_DATE_FORMAT = "%Y-%m-%dT%H:%M:%S+00:00"
+
+# Date windows the CLI and web UI paginate through in parallel by default
+DEFAULT_CONCURRENCY = 4
+
+
+def _split_date_range(start_date: datetime, end_date: datetime, parts: int) -> list[datetime]:
+    """Get the boundaries that split a date range into roughly equal windows.
+
+    Windows are at least a day long and boundaries fall on half-hour marks, so
+    each one is the start of an interval. Dates are split by wall-clock time,
+    matching how they are formatted for the API.
+
+    Returns:
+        The inner boundaries (empty if the range shouldn't be split)
+    """
+    start = start_date.replace(tzinfo=None)
+    end = end_date.replace(tzinfo=None)
+    parts = min(parts, int((end - start) / timedelta(days=1)))
+    if parts < 2:
+        return []
+
+    step = (end - start) / parts
+    boundaries = []
+    for i in range(1, parts):
+        boundary = start + step * i
+        boundaries.append(boundary.replace(
+            minute=boundary.minute - boundary.minute % 30,
+            second=0,
+            microsecond=0
+        ))
+    return boundaries
+
+
+def parse_timestamp(timestamp: str) -> datetime:
+    """Parse an API timestamp into an aware datetime (UTC if no offset is given)."""
+    # isoparse accepts a trailing Z, which fromisoformat only does from 3.11
+    parsed = isoparse(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
 
 
 class EonNextAPI:
     """Client for interacting with the Eon Next API."""
 
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """Initialize the client.
+
+        Args:
+            client: Optional shared HTTP client. If omitted, one is created on first
+                use and closed by aclose() (or on leaving an ``async with`` block).
+        """
         self.base_url = "https://api.eonnext-kraken.energy/v1/graphql/"
         self.auth_token: Optional[str] = None
         self.refresh_token: Optional[str] = None
         self.token_expires: Optional[int] = None
         self.refresh_expires: Optional[int] = None
+        self._client = client
+        self._owns_client = client is None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the HTTP client if it is owned by this instance."""
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the HTTP client, creating it on first use.
+
+        Reusing one client keeps connections alive between requests, so paginated
+        fetches don't pay a new TCP + TLS handshake per page.
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+            )
+        return self._client
 
     def _current_timestamp(self) -> int:
         """Get current Unix timestamp."""
@@ -46,29 +127,27 @@ class EonNextAPI:
                 raise Exception("Authentication token is not valid")
             headers["authorization"] = f"JWT {self.auth_token}"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.base_url,
-                json={
-                    "operationName": operation,
-                    "variables": variables or {},
-                    "query": query
-                },
-                headers=headers,
-                timeout=30.0
-            )
+        response = await self._get_client().post(
+            self.base_url,
+            json={
+                "operationName": operation,
+                "variables": variables or {},
+                "query": query
+            },
+            headers=headers
+        )
 
-            # Try to get JSON response even on error for better error messages
-            try:
-                response_data = response.json()
-            except Exception:
-                response_data = {}
+        # Try to get JSON response even on error for better error messages
+        try:
+            response_data = response.json()
+        except Exception:
+            response_data = {}
 
-            if not response.is_success:
-                error_msg = response_data.get("errors", [{}])[0].get("message", str(response_data))
-                raise Exception(f"GraphQL error ({response.status_code}): {error_msg}")
+        if not response.is_success:
+            error_msg = response_data.get("errors", [{}])[0].get("message", str(response_data))
+            raise Exception(f"GraphQL error ({response.status_code}): {error_msg}")
 
-            return response_data
+        return response_data
 
     async def login(self, username: str, password: str) -> bool:
         """Authenticate with username and password."""
@@ -211,7 +290,8 @@ class EonNextAPI:
         meter_type: str,
         start_date: datetime,
         end_date: datetime,
-        progress_callback=None
+        progress_callback=None,
+        concurrency: int = 1
     ) -> list[dict]:
         """Get consumption data for a meter over a date range.
 
@@ -222,14 +302,52 @@ class EonNextAPI:
             start_date: Start date for data retrieval
             end_date: End date for data retrieval
             progress_callback: Optional callback function(page_num, total_records) for progress updates
+            concurrency: Number of date windows to paginate through in parallel
 
         Returns:
             List of consumption data records
         """
+        consumption_data = []
+        async for batch in self.iter_consumption_data(
+            account_number,
+            meter_id,
+            meter_type,
+            start_date,
+            end_date,
+            progress_callback,
+            concurrency
+        ):
+            consumption_data.extend(batch)
+
+        return consumption_data
+
+    async def iter_consumption_data(
+        self,
+        account_number: str,
+        meter_id: str,
+        meter_type: str,
+        start_date: datetime,
+        end_date: datetime,
+        progress_callback=None,
+        concurrency: int = 1
+    ) -> AsyncIterator[list[dict]]:
+        """Iterate over consumption data for a meter, one page at a time.
+
+        Takes the same arguments as get_consumption_data(), but yields each page
+        of records as soon as it arrives instead of collecting them all first.
+
+        The API only offers cursor pagination, so with a concurrency above 1 the
+        date range is split into that many windows (of at least a day) which are
+        paginated in parallel. The first window streams as it arrives; later
+        windows are buffered until their turn so pages stay in order.
+
+        Yields:
+            Lists of consumption data records, in chronological order
+        """
 
         # Format dates as ISO strings with timezone (required by API)
-        start_str = start_date.strftime("%Y-%m-%dT%H:%M:%S+00:00")
-        end_str = end_date.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+        start_str = start_date.strftime(API_DATE_FORMAT)
+        end_str = end_date.strftime(API_DATE_FORMAT)
 
         if meter_type == "electricity":
             query = """
@@ -316,76 +434,115 @@ class EonNextAPI:
             """
             operation = "getGasConsumption"
 
-        # Paginate through all results
-        consumption_data = []
-        cursor = None
-        has_next_page = True
+        agreements_key = "electricityAgreements" if meter_type == "electricity" else "gasAgreements"
         page_count = 0
+        record_count = 0
 
-        while has_next_page:
-            page_count += 1
-
-            # Call progress callback if provided
-            if progress_callback:
-                progress_callback(page_count, len(consumption_data))
-
-            # Make the request with current cursor
-            variables = {
-                "accountNumber": account_number,
-                "startDate": start_str
-            }
-            if cursor:
-                variables["after"] = cursor
-
-            result = await self._graphql_request(operation, query, variables)
+        async def paginate(window_start: str, in_window) -> AsyncIterator[list[dict]]:
+            """Paginate from window_start until in_window(startAt) is false."""
+            nonlocal page_count, record_count
 
-            # Extract consumption data from the nested response
-            if "data" not in result or "account" not in result["data"]:
-                break
+            cursor = None
+            has_next_page = True
 
-            agreements_key = "electricityAgreements" if meter_type == "electricity" else "gasAgreements"
-            agreements = result["data"]["account"].get(agreements_key, [])
+            while has_next_page:
+                page_count += 1
 
-            for agreement in agreements:
-                meter_point = agreement.get("meterPoint")
-                if not meter_point:
-                    continue
+                # Call progress callback if provided
+                if progress_callback:
+                    progress_callback(page_count, record_count)
 
-                meters = meter_point.get("meters", [])
+                # Make the request with current cursor
+                variables = {
+                    "accountNumber": account_number,
+                    "startDate": window_start
+                }
+                if cursor:
+                    variables["after"] = cursor
+
+                result = await self._graphql_request(operation, query, variables)
+
+                # Extract consumption data from the nested response
+                if "data" not in result or "account" not in result["data"]:
+                    break
+
+                agreements = result["data"]["account"].get(agreements_key, [])
+
+                # Only continue if the meter is found and reports another page
+                has_next_page = False
+                page_records = []
+
+                for agreement in agreements:
+                    meter_point = agreement.get("meterPoint")
+                    if not meter_point:
+                        continue
+
+                    meters = meter_point.get("meters", [])
+
+                    for meter in meters:
+                        if meter and meter.get("id") == meter_id:
+                            consumption_connection = meter.get("consumption")
+                            if not consumption_connection:
+                                break
+
+                            edges = consumption_connection.get("edges", [])
+                            past_window = False
+
+                            # Extract nodes from edges and filter by end of window
+                            for edge in edges:
+                                if not edge:
+                                    continue
+                                node = edge.get("node")
+                                if not node:
+                                    continue
+
+                                interval_start = node.get("startAt", "")
+                                if interval_start:
+                                    if in_window(interval_start):
+                                        page_records.append(node)
+                                    else:
+                                        # Past the end of the window, stop pagination
+                                        past_window = True
+                                        break
+
+                            # Check pagination info
+                            page_info = consumption_connection.get("pageInfo", {})
+                            has_next_page = page_info.get("hasNextPage", False) and not past_window
+                            cursor = page_info.get("endCursor")
 
-                for meter in meters:
-                    if meter and meter.get("id") == meter_id:
-                        consumption_connection = meter.get("consumption")
-                        if not consumption_connection:
-                            has_next_page = False
                             break
 
-                        edges = consumption_connection.get("edges", [])
-
-                        # Extract nodes from edges and filter by end date
-                        for edge in edges:
-                            if not edge:
-                                continue
-                            node = edge.get("node")
-                            if not node:
-                                continue
-
-                            # Filter by end date if we have interval data
-                            interval_start = node.get("startAt", "")
-                            if interval_start:
-                                # Only include data up to the end date
-                                if interval_start <= end_str:
-                                    consumption_data.append(node)
-                                else:
-                                    # Past the end date, stop pagination
-                                    has_next_page = False
-                                    break
-
-                        # Check pagination info
-                        page_info = consumption_connection.get("pageInfo", {})
-                        has_next_page = page_info.get("hasNextPage", False) and has_next_page
-                        cursor = page_info.get("endCursor")
-
-                        break
-
-        return consumption_data
+                if page_records:
+                    record_count += len(page_records)
+                    yield page_records
+
+        # Window starts and membership tests. The last window keeps the original
+        # inclusive end-date comparison; inner boundaries compare instants, since
+        # returned timestamps carry Europe/London offsets.
+        boundaries = _split_date_range(start_date, end_date, concurrency)
+        window_starts = [start_str] + [b.strftime(API_DATE_FORMAT) for b in boundaries]
+        window_tests = [
+            lambda ts, stop=b.replace(tzinfo=timezone.utc): parse_timestamp(ts) < stop
+            for b in boundaries
+        ]
+        window_tests.append(lambda ts: ts <= end_str)
+
+        async def collect(i: int) -> list[list[dict]]:
+            return [batch async for batch in paginate(window_starts[i], window_tests[i])]
+
+        later_windows = [
+            asyncio.create_task(collect(i)) for i in range(1, len(window_starts))
+        ]
+        try:
+            async for batch in paginate(window_starts[0], window_tests[0]):
+                yield batch
+
+            for task in later_windows:
+                for batch in await task:
+                    yield batch
+        finally:
+            for task in later_windows:
+                task.cancel()
+            # Wait for the cancellations so no task is left running or holding
+            # an exception that is never retrieved
+            await asyncio.gather(*later_windows, return_exceptions=True)
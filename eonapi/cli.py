@@ -2,17 +2,27 @@
 
 import asyncio
 import csv
+import hashlib
+import io
+import json
+import operator
 import os
 import sys
-from datetime import datetime, timedelta
-from typing import Optional
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
 
 import click
 from dateutil.parser import isoparse
 
 from . import __version__
-from .api import EonNextAPI
-from .database import ConsumptionDatabase
+from .api import DEFAULT_CONCURRENCY, EonNextAPI, parse_timestamp
+from .stats import INTERVALS_PER_DAY, summarize
+
+if TYPE_CHECKING:
+    from .database import ConsumptionDatabase
 
 
 def get_credentials(username: Optional[str], password: Optional[str]) -> tuple[str, str]:
@@ -34,6 +44,90 @@ def get_credentials(username: Optional[str], password: Optional[str]) -> tuple[s
     return final_username, final_password
 
 
+# How long cached account numbers and meters stay valid (24 hours)
+METER_CACHE_TTL = 24 * 60 * 60
+
+
+def get_meter_cache_path() -> Path:
+    """Get the path of the on-disk account/meter cache."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "eonapi" / "meters.json"
+
+
+def _read_meter_cache() -> dict:
+    """Read the whole meter cache file, or an empty cache if it is missing or corrupt."""
+    try:
+        with open(get_meter_cache_path()) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _meter_cache_key(username: str) -> str:
+    """Cache entries are keyed by a hash so the file doesn't store email addresses."""
+    return hashlib.sha256(username.encode("utf-8")).hexdigest()
+
+
+def load_cached_meters(username: str) -> Optional[tuple[str, list[dict]]]:
+    """Get the cached account number and meters for a user.
+
+    Returns:
+        Tuple of (account_number, meters), or None if nothing fresh is cached
+    """
+    entry = _read_meter_cache().get(_meter_cache_key(username))
+    if not entry or time.time() - entry.get("fetched_at", 0) > METER_CACHE_TTL:
+        return None
+    return entry["account_number"], entry["meters"]
+
+
+def save_cached_meters(username: str, account_number: str, meters: list[dict]):
+    """Cache the account number and meters for a user. Failures are ignored."""
+    cache = _read_meter_cache()
+    cache[_meter_cache_key(username)] = {
+        "fetched_at": time.time(),
+        "account_number": account_number,
+        "meters": meters,
+    }
+
+    path = get_meter_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(cache, f)
+    except OSError:
+        pass
+
+
+# Buffer size for CSV output; large exports otherwise make many small writes
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+@contextmanager
+def buffered_output(output) -> Iterator:
+    """Write to a text stream through a large buffer.
+
+    Terminals and streams without an underlying binary buffer are used
+    as they are, so interactive output still appears promptly.
+    """
+    if output.isatty() or not hasattr(output, "buffer"):
+        yield output
+        return
+
+    output.flush()
+    wrapper = io.TextIOWrapper(
+        io.BufferedWriter(output.buffer, buffer_size=OUTPUT_BUFFER_SIZE),
+        encoding=output.encoding,
+        newline="",
+    )
+    try:
+        yield wrapper
+    finally:
+        wrapper.flush()
+        # Detach both layers so neither closes the original stream when collected
+        wrapper.detach().detach()
+
+
 @click.group()
 @click.version_option(version=__version__, prog_name="eonapi")
 @click.pass_context
@@ -73,6 +167,13 @@ def cli(ctx):
     "-m",
     help="Meter serial number (optional - will prompt if multiple meters found)"
 )
+@click.option(
+    "--concurrency",
+    "-c",
+    default=DEFAULT_CONCURRENCY,
+    type=click.IntRange(min=1),
+    help=f"Number of date ranges to fetch in parallel (default: {DEFAULT_CONCURRENCY})"
+)
 @click.option(
     "--output",
     "-o",
@@ -95,6 +196,7 @@ def export(
     password: Optional[str],
     days: int,
     meter: Optional[str],
+    concurrency: int,
     output,
     store: bool,
     db: str
@@ -119,55 +221,53 @@ def export(
         # Get credentials
         final_username, final_password = get_credentials(username, password)
 
-        # Initialize database if --store is used
         if store:
-            click.echo(f"Using database: {db}", err=True)
-            database = ConsumptionDatabase(db)
-
-        # Fetch data with optional incremental update
-        consumption_data, selected_meter = asyncio.run(
-            fetch_data(
-                final_username,
-                final_password,
-                days,
-                meter,
-                database if store else None
-            )
-        )
+            # Only needed for --store, so plain exports don't load sqlite3
+            from .database import ConsumptionDatabase
 
-        # Store in database if --store is used
-        if store:
-            inserted, skipped = database.store_records(
-                consumption_data,
-                selected_meter["serial"],
-                selected_meter["type"]
-            )
-            click.echo(
-                f"\nDatabase updated: {inserted} new records inserted, "
-                f"{skipped} duplicates skipped.",
-                err=True
-            )
-            total_records = database.get_record_count(selected_meter["serial"])
-            click.echo(
-                f"Total records in database for this meter: {total_records}",
-                err=True
-            )
+            click.echo(f"Using database: {db}", err=True)
+            with ConsumptionDatabase(db) as database:
+                # Fetch data with incremental update
+                selected_meter, inserted, skipped = asyncio.run(
+                    sync_database(
+                        final_username, final_password, days, meter, database, concurrency
+                    )
+                )
+
+                total_records = database.get_record_count(selected_meter["serial"])
+                click.echo(
+                    f"\nDatabase updated: {inserted} new records inserted, "
+                    f"{skipped} duplicates skipped.\n"
+                    f"Total records in database for this meter: {total_records}",
+                    err=True
+                )
         else:
-            # Output CSV (original behavior)
-            writer = csv.writer(output)
-
-            # Write header
-            writer.writerow(["interval_start", "interval_end", "consumption_kwh"])
-
-            # Write data rows
-            for record in consumption_data:
-                writer.writerow([
-                    record.get("startAt", ""),
-                    record.get("endAt", ""),
-                    record.get("value", "")
-                ])
-
-            click.echo(f"\nSuccessfully exported {len(consumption_data)} records.", err=True)
+            # Output CSV, writing each page as it arrives
+            with buffered_output(output) as stream:
+                writer = csv.writer(stream)
+                header = ["interval_start", "interval_end", "consumption_kwh"]
+                header_written = False
+                # Pull each row's fields out in C
+                row_fields = operator.itemgetter("startAt", "endAt", "value")
+
+                def write_batch(batch, meter):
+                    nonlocal header_written
+                    if not header_written:
+                        writer.writerow(header)
+                        header_written = True
+                    writer.writerows(map(row_fields, batch))
+
+                _, record_count = asyncio.run(
+                    stream_data(
+                        final_username, final_password, days, meter, write_batch,
+                        concurrency=concurrency
+                    )
+                )
+
+                if not header_written:
+                    writer.writerow(header)
+
+            click.echo(f"\nSuccessfully exported {record_count} records.", err=True)
 
     except click.ClickException:
         raise
@@ -198,7 +298,25 @@ def export(
     "-m",
     help="Meter serial number (optional - will prompt if multiple meters found)"
 )
-def stats(username: Optional[str], password: Optional[str], days: int, meter: Optional[str]):
+@click.option(
+    "--concurrency",
+    "-c",
+    default=DEFAULT_CONCURRENCY,
+    type=click.IntRange(min=1),
+    help=f"Number of date ranges to fetch in parallel (default: {DEFAULT_CONCURRENCY})"
+)
+@click.option(
+    "--db",
+    help="Update this SQLite database and compute statistics from it"
+)
+def stats(
+    username: Optional[str],
+    password: Optional[str],
+    days: int,
+    meter: Optional[str],
+    concurrency: int,
+    db: Optional[str]
+):
     """
     Display consumption statistics.
 
@@ -213,39 +331,56 @@ def stats(username: Optional[str], password: Optional[str], days: int, meter: Op
         eonpy stats --days 30
 
         eonpy stats --days 7
+
+        eonpy stats --days 30 --db ./eon-data.db
     """
     try:
         # Get credentials
         final_username, final_password = get_credentials(username, password)
 
-        # Fetch data
-        consumption_data, selected_meter = asyncio.run(
-            fetch_data(final_username, final_password, days, meter)
-        )
+        if db:
+            from .database import ConsumptionDatabase
+
+            # Bring the database up to date over the whole window, then
+            # aggregate in SQLite
+            with ConsumptionDatabase(db) as database:
+                selected_meter, _, _ = asyncio.run(
+                    sync_database(
+                        final_username, final_password, days, meter, database,
+                        concurrency, backfill=True
+                    )
+                )
+                total_kwh, interval_count, peak_kwh, peak_time = database.compute_stats(
+                    selected_meter["serial"],
+                    # Aware, so the window doesn't shift with the local UTC offset
+                    start_date=datetime.now(timezone.utc) - timedelta(days=days)
+                )
+        else:
+            # Fetch data
+            consumption_data, selected_meter = asyncio.run(
+                fetch_data(final_username, final_password, days, meter, concurrency=concurrency)
+            )
+
+            total_kwh, peak_kwh, peak_time = summarize(consumption_data)
+            interval_count = len(consumption_data)
 
         # Calculate statistics
-        if not consumption_data:
+        if not interval_count:
             click.echo("No consumption data available for analysis.", err=True)
             return
 
-        total_kwh = sum(float(record.get("value", 0)) for record in consumption_data)
-        num_days = len(consumption_data) / 48  # 48 half-hour intervals per day
+        num_days = interval_count / INTERVALS_PER_DAY
         avg_daily = total_kwh / num_days if num_days > 0 else 0
 
-        # Find peak usage
-        peak_record = max(consumption_data, key=lambda r: float(r.get("value", 0)))
-        peak_kwh = float(peak_record.get("value", 0))
-        peak_time = peak_record.get("startAt", "")
-
         # Display statistics
         click.echo("\n" + "="*60)
         click.echo(f"  Consumption Statistics - {selected_meter['type'].title()} Meter")
         click.echo("="*60)
         click.echo(f"\nMeter Serial: {selected_meter['serial']}")
-        click.echo(f"Period: {days} days ({len(consumption_data)} half-hour intervals)")
+        click.echo(f"Period: {days} days ({interval_count} half-hour intervals)")
         click.echo(f"\nTotal Consumption: {total_kwh:.2f} kWh")
         click.echo(f"Average Daily: {avg_daily:.2f} kWh/day")
-        click.echo(f"Average per interval: {total_kwh/len(consumption_data):.3f} kWh")
+        click.echo(f"Average per interval: {total_kwh/interval_count:.3f} kWh")
         click.echo(f"\nPeak Usage: {peak_kwh:.2f} kWh")
         click.echo(f"Peak Time: {peak_time}")
         click.echo("\n" + "="*60 + "\n")
@@ -284,13 +419,13 @@ def ui(port: int, host: str):
         eonapi ui --port 8080 --host 0.0.0.0
     """
     try:
-        import uvicorn
-        from .server import app
+        import uvicorn  # noqa: F401
+        from .server import run
 
         click.echo(f"Starting eonapi web UI on http://{host}:{port}")
         click.echo("Press CTRL+C to stop the server\n")
 
-        uvicorn.run(app, host=host, port=port, log_level="info")
+        run(host=host, port=port)
     except ImportError:
         raise click.ClickException(
             "FastAPI and uvicorn are required for the web UI. "
@@ -305,7 +440,8 @@ async def fetch_data(
     password: str,
     days: int,
     meter_serial: Optional[str],
-    database: Optional[ConsumptionDatabase] = None
+    database: Optional["ConsumptionDatabase"] = None,
+    concurrency: int = 1
 ):
     """Fetch consumption data from Eon Next API.
 
@@ -315,125 +451,236 @@ async def fetch_data(
         days: Number of days to fetch (used if no database or no existing data)
         meter_serial: Optional meter serial number
         database: Optional database for incremental updates
+        concurrency: Number of date ranges to fetch in parallel
+
+    Returns:
+        Tuple of (consumption_data, selected_meter)
     """
-    api = EonNextAPI()
+    consumption = []
+    selected_meter, _ = await stream_data(
+        username,
+        password,
+        days,
+        meter_serial,
+        lambda batch, meter: consumption.extend(batch),
+        database,
+        concurrency
+    )
 
-    # Authenticate
-    click.echo("Authenticating...", err=True)
-    if not await api.login(username, password):
-        raise click.ClickException("Authentication failed. Check your credentials.")
+    return consumption, selected_meter
 
-    click.echo("Authentication successful!", err=True)
 
-    # Get accounts
-    click.echo("Fetching account information...", err=True)
-    accounts = await api.get_account_numbers()
+async def sync_database(
+    username: str,
+    password: str,
+    days: int,
+    meter_serial: Optional[str],
+    database: "ConsumptionDatabase",
+    concurrency: int = 1,
+    backfill: bool = False
+) -> tuple[dict, int, int]:
+    """Fetch new consumption data into the database, storing each page as it arrives.
+
+    Returns:
+        Tuple of (selected_meter, inserted_count, skipped_count)
+    """
+    inserted = skipped = 0
 
-    if not accounts:
-        raise click.ClickException("No accounts found.")
+    def store_batch(batch, meter):
+        nonlocal inserted, skipped
+        batch_inserted, batch_skipped = database.store_records(
+            batch, meter["serial"], meter["type"]
+        )
+        inserted += batch_inserted
+        skipped += batch_skipped
 
-    # Use first account (most users have only one)
-    account_number = accounts[0]
-    click.echo(f"Using account: {account_number}", err=True)
+    with database.deferred_indexes():
+        selected_meter, _ = await stream_data(
+            username, password, days, meter_serial, store_batch, database,
+            concurrency, backfill
+        )
+    return selected_meter, inserted, skipped
 
-    # Get meters
-    click.echo("Fetching meters...", err=True)
-    meters = await api.get_meters(account_number)
 
-    if not meters:
-        raise click.ClickException("No meters found.")
+async def stream_data(
+    username: str,
+    password: str,
+    days: int,
+    meter_serial: Optional[str],
+    handle_batch: Callable[[list[dict], dict], None],
+    database: Optional["ConsumptionDatabase"] = None,
+    concurrency: int = 1,
+    backfill: bool = False
+) -> tuple[dict, int]:
+    """Fetch consumption data from Eon Next API page by page.
 
-    # Select meter
-    selected_meter = None
+    Each page of records is passed to ``handle_batch(batch, selected_meter)`` as
+    soon as it arrives, so callers can write it out without holding every
+    record in memory.
 
-    if meter_serial:
-        # Find meter by serial number
-        for meter in meters:
-            if meter["serial"] == meter_serial:
-                selected_meter = meter
-                break
+    Args:
+        username: Eon Next username
+        password: Eon Next password
+        days: Number of days to fetch (used if no database or no existing data)
+        meter_serial: Optional meter serial number
+        handle_batch: Callback receiving each page of records and the selected meter
+        database: Optional database for incremental updates
+        concurrency: Number of date ranges to fetch in parallel
+        backfill: Also fetch the whole window if the database doesn't reach
+            back ``days`` days
 
-        if not selected_meter:
-            raise click.ClickException(f"Meter with serial {meter_serial} not found.")
-    elif len(meters) == 1:
-        # Auto-select single meter
-        selected_meter = meters[0]
-        click.echo(
-            f"Auto-selected meter: {selected_meter['serial']} ({selected_meter['type']})",
-            err=True
-        )
-    else:
-        # Multiple meters - prompt user
-        click.echo("\nAvailable meters:", err=True)
-        for idx, meter in enumerate(meters, 1):
-            click.echo(
-                f"  {idx}. {meter['serial']} - {meter['type']}",
-                err=True
-            )
+    Returns:
+        Tuple of (selected_meter, record_count)
+    """
+    api = EonNextAPI()
+
+    # Reuse one HTTP connection pool for every request in this session
+    async with api:
+        # Authenticate
+        click.echo("Authenticating...", err=True)
+        if not await api.login(username, password):
+            raise click.ClickException("Authentication failed. Check your credentials.")
+
+        click.echo("Authentication successful!", err=True)
+
+        # Accounts and meters rarely change, so reuse a recent lookup if it has
+        # the requested meter
+        cached = load_cached_meters(username)
+        if cached and (
+            not meter_serial or any(m["serial"] == meter_serial for m in cached[1])
+        ):
+            account_number, meters = cached
+            click.echo(f"Using account: {account_number} (cached)", err=True)
+        else:
+            # Get accounts
+            click.echo("Fetching account information...", err=True)
+            accounts = await api.get_account_numbers()
+
+            if not accounts:
+                raise click.ClickException("No accounts found.")
 
-        while True:
-            try:
-                choice = click.prompt("\nSelect meter number", type=int, err=True)
-                if 1 <= choice <= len(meters):
-                    selected_meter = meters[choice - 1]
+            # Use first account (most users have only one)
+            account_number = accounts[0]
+            click.echo(f"Using account: {account_number}", err=True)
+
+            # Get meters
+            click.echo("Fetching meters...", err=True)
+            meters = await api.get_meters(account_number)
+
+            if not meters:
+                raise click.ClickException("No meters found.")
+
+            save_cached_meters(username, account_number, meters)
+
+        # Select meter
+        selected_meter = None
+
+        if meter_serial:
+            # Find meter by serial number
+            for meter in meters:
+                if meter["serial"] == meter_serial:
+                    selected_meter = meter
                     break
-                else:
-                    click.echo(f"Please enter a number between 1 and {len(meters)}", err=True)
-            except click.Abort:
-                raise click.ClickException("Aborted by user.")
-
-    # Calculate date range
-    end_date = datetime.now()
-
-    # Check if we should do incremental update
-    if database:
-        latest_interval = database.get_latest_interval(selected_meter["serial"])
-        if latest_interval:
-            # Parse the latest interval and start from there
-            start_date = isoparse(latest_interval)
+
+            if not selected_meter:
+                raise click.ClickException(f"Meter with serial {meter_serial} not found.")
+        elif len(meters) == 1:
+            # Auto-select single meter
+            selected_meter = meters[0]
             click.echo(
-                f"Found existing data up to {latest_interval}",
+                f"Auto-selected meter: {selected_meter['serial']} ({selected_meter['type']})",
                 err=True
             )
-            click.echo(
-                f"Fetching incremental data from {start_date.strftime('%Y-%m-%d %H:%M:%S')}...",
-                err=True
+        else:
+            # Multiple meters - prompt user
+            click.echo("\nAvailable meters:", err=True)
+            for idx, meter in enumerate(meters, 1):
+                click.echo(
+                    f"  {idx}. {meter['serial']} - {meter['type']}",
+                    err=True
+                )
+
+            while True:
+                try:
+                    choice = click.prompt("\nSelect meter number", type=int, err=True)
+                    if 1 <= choice <= len(meters):
+                        selected_meter = meters[choice - 1]
+                        break
+                    else:
+                        click.echo(f"Please enter a number between 1 and {len(meters)}", err=True)
+                except click.Abort:
+                    raise click.ClickException("Aborted by user.")
+
+        # Calculate date range
+        end_date = datetime.now()
+
+        # Check if we should do incremental update
+        if database:
+            latest_interval = database.get_latest_interval(selected_meter["serial"])
+            earliest_interval = (
+                database.get_earliest_interval(selected_meter["serial"])
+                if backfill and latest_interval else None
             )
+            window_start = end_date - timedelta(days=days)
+            # Allow one interval of slack, as the API rounds up to the next half hour
+            if earliest_interval and parse_timestamp(earliest_interval) - timedelta(
+                minutes=30
+            ) > window_start.astimezone():
+                # The stored data doesn't reach back far enough: fetch the whole
+                # window, as intervals already stored are skipped
+                start_date = window_start
+                click.echo(
+                    f"Existing data only goes back to {earliest_interval}\n"
+                    f"Fetching last {days} days...",
+                    err=True
+                )
+            elif latest_interval:
+                # Parse the latest interval and start from there
+                start_date = isoparse(latest_interval)
+                click.echo(
+                    f"Found existing data up to {latest_interval}\n"
+                    f"Fetching incremental data from {start_date.strftime('%Y-%m-%d %H:%M:%S')}...",
+                    err=True
+                )
+            else:
+                # No existing data, use the days parameter
+                start_date = end_date - timedelta(days=days)
+                click.echo(
+                    f"No existing data found. Fetching last {days} days...",
+                    err=True
+                )
         else:
-            # No existing data, use the days parameter
+            # Normal mode: fetch last N days
             start_date = end_date - timedelta(days=days)
-            click.echo(
-                f"No existing data found. Fetching last {days} days...",
-                err=True
-            )
-    else:
-        # Normal mode: fetch last N days
-        start_date = end_date - timedelta(days=days)
-
-    click.echo(
-        f"Fetching {selected_meter['type']} consumption data from "
-        f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}...",
-        err=True
-    )
 
-    # Progress callback to show pagination status
-    def show_progress(page_num, record_count):
-        click.echo(f"Fetching page {page_num}... ({record_count} records so far)", err=True)
-
-    # Fetch consumption data
-    consumption = await api.get_consumption_data(
-        account_number=account_number,
-        meter_id=selected_meter["id"],
-        meter_type=selected_meter["type"],
-        start_date=start_date,
-        end_date=end_date,
-        progress_callback=show_progress
-    )
-
-    if not consumption:
-        click.echo("Warning: No consumption data returned.", err=True)
+        click.echo(
+            f"Fetching {selected_meter['type']} consumption data from "
+            f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}...",
+            err=True
+        )
 
-    return consumption, selected_meter
+        # Progress callback to show pagination status
+        def show_progress(page_num, record_count):
+            click.echo(f"Fetching page {page_num}... ({record_count} records so far)", err=True)
+
+        # Fetch consumption data
+        record_count = 0
+        async for batch in api.iter_consumption_data(
+            account_number=account_number,
+            meter_id=selected_meter["id"],
+            meter_type=selected_meter["type"],
+            start_date=start_date,
+            end_date=end_date,
+            progress_callback=show_progress,
+            concurrency=concurrency
+        ):
+            handle_batch(batch, selected_meter)
+            record_count += len(batch)
+
+        if not record_count:
+            click.echo("Warning: No consumption data returned.", err=True)
+
+    return selected_meter, record_count
 
 
 def main():
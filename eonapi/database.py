@@ -1,8 +1,54 @@
 """SQLite database module for storing consumption data."""
 
 import sqlite3
-from datetime import datetime
-from typing import Optional
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import chain
+from typing import Iterator, Optional
+
+# Rows per INSERT statement. Keeps the bound parameters (7 per row) under
+# SQLite's older 999-variable limit
+INSERT_BATCH_ROWS = 100
+
+# SQLite converts the timestamp's UTC offset itself, so the epoch column needs
+# no parsing in Python
+_INSERT_ROW = "(?, ?, ?, CAST(strftime('%s', ?) AS INTEGER), ?, ?, ?)"
+
+
+def _epoch_seconds(value: datetime) -> int:
+    """Convert a date filter to epoch seconds, taking naive datetimes as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _records_query(
+    meter_serial: Optional[str],
+    start_date: Optional[datetime],
+    end_date: Optional[datetime]
+) -> tuple[str, list]:
+    """Build the SELECT used by iter_records() for the given filters.
+
+    Returns:
+        Tuple of (sql, params)
+    """
+    query = "SELECT * FROM consumption WHERE 1=1"
+    params = []
+
+    if meter_serial:
+        query += " AND meter_serial = ?"
+        params.append(meter_serial)
+
+    if start_date:
+        query += " AND interval_start_ts >= ?"
+        params.append(_epoch_seconds(start_date))
+
+    if end_date:
+        query += " AND interval_start_ts <= ?"
+        params.append(_epoch_seconds(end_date))
+
+    query += " ORDER BY interval_start_ts"
+    return query, params
 
 
 class ConsumptionDatabase:
@@ -15,17 +61,46 @@ class ConsumptionDatabase:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        # Set during deferred_indexes(), when range reads have no index to use
+        self._indexes_deferred = False
         self._init_database()
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the database connection."""
+        self._conn.close()
+
     def _init_database(self):
-        """Create database tables if they don't exist."""
-        with sqlite3.connect(self.db_path) as conn:
+        """Create database tables if they don't exist and tune the connection."""
+        conn = self._conn
+
+        # WAL lets readers run alongside the writer and, with synchronous=NORMAL,
+        # only syncs on checkpoints rather than on every commit. Memory-mapped
+        # reads avoid a copy per page. A database that can't switch to WAL
+        # (e.g. on read-only media) keeps its current journal mode.
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.OperationalError:
+            pass
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.execute("PRAGMA mmap_size=268435456")
+
+        with conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS consumption (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     meter_serial TEXT NOT NULL,
                     meter_type TEXT NOT NULL,
                     interval_start TEXT NOT NULL,
+                    interval_start_ts INTEGER NOT NULL,
                     interval_end TEXT NOT NULL,
                     consumption_kwh REAL NOT NULL,
                     created_at TEXT NOT NULL,
@@ -33,8 +108,51 @@ class ConsumptionDatabase:
                 )
             """)
 
-            # The UNIQUE constraint on (meter_serial, interval_start) already creates an index.
-            conn.commit()
+            # Databases from older versions only have the ISO string, which
+            # doesn't sort in time order across a clock change. Adding the
+            # column needs write access, so they must be opened writable once.
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(consumption)")}
+            if "interval_start_ts" not in columns:
+                conn.execute("ALTER TABLE consumption ADD COLUMN interval_start_ts INTEGER")
+                conn.execute("""
+                    UPDATE consumption
+                    SET interval_start_ts = CAST(strftime('%s', interval_start) AS INTEGER)
+                """)
+
+            self._create_indexes()
+
+    def _create_indexes(self):
+        """Create the secondary indexes if they don't exist."""
+        # Ordering, latest-interval lookups and date filters use the epoch
+        # seconds, comparing integers rather than strings
+        self._conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_consumption_meter_start_ts
+            ON consumption(meter_serial, interval_start_ts)
+        """)
+
+    @contextmanager
+    def deferred_indexes(self) -> Iterator[None]:
+        """Build secondary indexes once at the end of an initial bulk load.
+
+        If the database is empty, the secondary indexes are dropped for the
+        duration of the block and rebuilt in one pass afterwards, rather than
+        being updated row by row. Otherwise the block runs with them in place.
+        The UNIQUE constraint stays active throughout, so duplicates are still
+        detected.
+        """
+        if self._conn.execute("SELECT 1 FROM consumption LIMIT 1").fetchone():
+            yield
+            return
+
+        with self._conn:
+            self._conn.execute("DROP INDEX IF EXISTS idx_consumption_meter_start_ts")
+        self._indexes_deferred = True
+        try:
+            yield
+        finally:
+            self._indexes_deferred = False
+            with self._conn:
+                self._create_indexes()
 
     def get_latest_interval(self, meter_serial: str) -> Optional[str]:
         """Get the latest interval_start timestamp for a meter.
@@ -45,17 +163,35 @@ class ConsumptionDatabase:
         Returns:
             Latest interval_start timestamp as ISO string, or None if no data exists
         """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT interval_start
-                FROM consumption
-                WHERE meter_serial = ?
-                ORDER BY interval_start DESC
-                LIMIT 1
-            """, (meter_serial,))
+        # A single seek to the end of the meter's entries in the epoch index
+        row = self._conn.execute("""
+            SELECT interval_start
+            FROM consumption
+            WHERE meter_serial = ?
+            ORDER BY interval_start_ts DESC
+            LIMIT 1
+        """, (meter_serial,)).fetchone()
 
-            result = cursor.fetchone()
-            return result[0] if result else None
+        return row[0] if row else None
+
+    def get_earliest_interval(self, meter_serial: str) -> Optional[str]:
+        """Get the earliest interval_start timestamp for a meter.
+
+        Args:
+            meter_serial: The meter serial number
+
+        Returns:
+            Earliest interval_start timestamp as ISO string, or None if no data exists
+        """
+        row = self._conn.execute("""
+            SELECT interval_start
+            FROM consumption
+            WHERE meter_serial = ?
+            ORDER BY interval_start_ts ASC
+            LIMIT 1
+        """, (meter_serial,)).fetchone()
+
+        return row[0] if row else None
 
     def store_records(
         self,
@@ -73,33 +209,66 @@ class ConsumptionDatabase:
         Returns:
             Tuple of (inserted_count, skipped_count)
         """
-        inserted = 0
-        skipped = 0
+        if not records:
+            return 0, 0
+
+        # Re-synced pages mostly overlap what is already stored, so drop known
+        # intervals first with one indexed range read. A page that is all
+        # duplicates then needs no write transaction. The range runs from the
+        # first record to the last; anything outside it is still caught by
+        # ON CONFLICT below. Skipped during an initial load, which starts from
+        # an empty table and has no index for the range.
+        existing = set() if self._indexes_deferred else {
+            row[0] for row in self._conn.execute("""
+                WITH bounds(a, b) AS (
+                    SELECT CAST(strftime('%s', ?) AS INTEGER),
+                           CAST(strftime('%s', ?) AS INTEGER)
+                )
+                SELECT interval_start
+                FROM consumption, bounds
+                WHERE meter_serial = ?
+                AND interval_start_ts BETWEEN MIN(a, b) AND MAX(a, b)
+            """, (records[0]["startAt"], records[-1]["startAt"], meter_serial))
+        }
+
         created_at = datetime.now().isoformat()
+        # The API always returns these fields, so index them directly
+        rows = [
+            (
+                meter_serial,
+                meter_type,
+                record["startAt"],
+                record["startAt"],
+                record["endAt"],
+                float(record["value"]),
+                created_at
+            )
+            for record in records
+            if record["startAt"] not in existing
+        ]
+        if not rows:
+            return 0, len(records)
 
-        with sqlite3.connect(self.db_path) as conn:
-            for record in records:
-                try:
-                    conn.execute("""
-                        INSERT INTO consumption
-                        (meter_serial, meter_type, interval_start, interval_end,
-                         consumption_kwh, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (
-                        meter_serial,
-                        meter_type,
-                        record.get("startAt", ""),
-                        record.get("endAt", ""),
-                        float(record.get("value", 0)),
-                        created_at
-                    ))
-                    inserted += 1
-                except sqlite3.IntegrityError:
-                    # Record already exists, skip it
-                    skipped += 1
-
-            conn.commit()
+        with self._conn as conn:
+            # Duplicates are never written, so the change count is the number
+            # of rows inserted
+            changes_before = conn.total_changes
+            # Several rows per statement cut SQLite's per-statement overhead.
+            # Only duplicate intervals are skipped; any other constraint
+            # violation still raises
+            for i in range(0, len(rows), INSERT_BATCH_ROWS):
+                batch = rows[i:i + INSERT_BATCH_ROWS]
+                conn.execute(
+                    "INSERT INTO consumption "
+                    "(meter_serial, meter_type, interval_start, interval_start_ts, "
+                    "interval_end, consumption_kwh, created_at) "
+                    f"VALUES {', '.join([_INSERT_ROW] * len(batch))} "
+                    "ON CONFLICT(meter_serial, interval_start) DO NOTHING",
+                    list(chain.from_iterable(batch))
+                )
+            inserted = conn.total_changes - changes_before
 
+        skipped = len(records) - inserted
         return inserted, skipped
 
     def get_all_records(
@@ -107,40 +276,90 @@ class ConsumptionDatabase:
         meter_serial: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None
-    ) -> list[dict]:
+    ) -> list[sqlite3.Row]:
         """Retrieve consumption records from the database.
 
         Args:
             meter_serial: Optional meter serial to filter by
-            start_date: Optional start date filter
-            end_date: Optional end date filter
+            start_date: Optional start date filter, taken as UTC if naive
+            end_date: Optional end date filter, taken as UTC if naive
 
         Returns:
-            List of consumption records
+            List of consumption records, as rows that can be indexed by column name
         """
-        query = "SELECT * FROM consumption WHERE 1=1"
-        params = []
+        return list(self.iter_records(meter_serial, start_date, end_date))
 
-        if meter_serial:
-            query += " AND meter_serial = ?"
-            params.append(meter_serial)
+    def iter_records(
+        self,
+        meter_serial: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Iterator[sqlite3.Row]:
+        """Iterate over consumption records without loading them all into memory.
+
+        Takes the same filters as get_all_records().
+
+        Yields:
+            Consumption records in interval order, as rows that can be indexed by
+            column name
+        """
+        query, params = _records_query(meter_serial, start_date, end_date)
+
+        cursor = self._conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        cursor.arraysize = 1000
+        cursor.execute(query, params)
+
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            yield from rows
+
+    def compute_stats(
+        self,
+        meter_serial: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> tuple[float, int, Optional[float], Optional[str]]:
+        """Aggregate stored consumption for a meter inside SQLite.
+
+        Args:
+            meter_serial: The meter serial number
+            start_date: Optional start date filter, taken as UTC if naive
+            end_date: Optional end date filter, taken as UTC if naive
+
+        Returns:
+            Tuple of (total_kwh, interval_count, peak_kwh, peak_interval_start).
+            Peak values are None if there are no matching records.
+        """
+        where = "WHERE meter_serial = ?"
+        params = [meter_serial]
 
         if start_date:
-            query += " AND interval_start >= ?"
-            params.append(start_date.isoformat())
+            where += " AND interval_start_ts >= ?"
+            params.append(_epoch_seconds(start_date))
 
         if end_date:
-            query += " AND interval_start <= ?"
-            params.append(end_date.isoformat())
+            where += " AND interval_start_ts <= ?"
+            params.append(_epoch_seconds(end_date))
 
-        query += " ORDER BY interval_start"
+        total, count, peak = self._conn.execute(
+            "SELECT COALESCE(SUM(consumption_kwh), 0), COUNT(*), MAX(consumption_kwh) "
+            f"FROM consumption {where}",
+            params
+        ).fetchone()
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(query, params)
-            rows = cursor.fetchall()
+        peak_time = None
+        if count:
+            # Earliest interval wins if several share the peak value
+            peak_time = self._conn.execute(
+                f"SELECT interval_start FROM consumption {where} "
+                "ORDER BY consumption_kwh DESC, interval_start_ts LIMIT 1",
+                params
+            ).fetchone()[0]
 
-            return [dict(row) for row in rows]
+        return total, count, peak, peak_time
 
     def get_record_count(self, meter_serial: Optional[str] = None) -> int:
         """Get the total number of records in the database.
@@ -158,6 +377,5 @@ class ConsumptionDatabase:
             query += " WHERE meter_serial = ?"
             params.append(meter_serial)
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(query, params)
-            return cursor.fetchone()[0]
+        cursor = self._conn.execute(query, params)
+        return cursor.fetchone()[0]
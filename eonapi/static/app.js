@@ -0,0 +1,412 @@
+const { createApp, markRaw } = Vue;
+
+// Locale formatting is slow and the same dates are formatted on every render,
+// so keep each result
+const formatCache = new Map();
+
+// Chart series carry raw numbers; these format them for axis labels and
+// tooltips only, and are built once rather than per call
+const kwh2 = new Intl.NumberFormat('en', {
+    minimumFractionDigits: 2, maximumFractionDigits: 2, useGrouping: false
+});
+const kwh3 = new Intl.NumberFormat('en', {
+    minimumFractionDigits: 3, maximumFractionDigits: 3, useGrouping: false
+});
+
+// Beyond this many bars the daily chart is drawn with fewer SVG elements
+// and without animation or resize redraws
+const LARGE_CHART_BARS = 60;
+
+function cachedFormat(key, format) {
+    let formatted = formatCache.get(key);
+    if (formatted === undefined) {
+        formatted = format();
+        formatCache.set(key, formatted);
+    }
+    return formatted;
+}
+
+createApp({
+    data() {
+        return {
+            credentials: {
+                username: '',
+                password: '',
+                days: 30
+            },
+            isAuthenticated: false,
+            loading: false,
+            error: null,
+            meterData: null,
+            mainChart: null,
+            selectedDay: null,
+            dailyDataMap: markRaw(new Map()),
+            intervalValues: null,
+            sortedDates: []
+        };
+    },
+    async mounted() {
+        // Log version for debugging
+        console.log('%c🔌 E.ON API UI v0.2.0', 'color: #3b82f6; font-weight: bold; font-size: 14px;');
+        console.log('Build: 2025-11-13 | ApexCharts with 200ms animations');
+
+        // Check if we have cached data
+        const cachedData = localStorage.getItem('eonapi_meter_data');
+        const cachedCredentials = localStorage.getItem('eonapi_credentials');
+
+        if (cachedData && cachedCredentials) {
+            try {
+                const meterData = JSON.parse(cachedData);
+                if (!meterData.times) {
+                    // Saved by an older version in a different format
+                    throw new Error('Outdated cached data');
+                }
+                this.meterData = meterData;
+                this.credentials = JSON.parse(cachedCredentials);
+                this.isAuthenticated = true;
+
+                await this.$nextTick();
+                await this.createCharts();
+            } catch (e) {
+                // If parsing fails, clear cache
+                localStorage.removeItem('eonapi_meter_data');
+                localStorage.removeItem('eonapi_credentials');
+                localStorage.removeItem('eonapi_meter_data_etag');
+            }
+        }
+    },
+    methods: {
+        async handleLogin() {
+            this.loading = true;
+            this.error = null;
+
+            try {
+                const headers = {
+                    'Content-Type': 'application/json'
+                };
+                // Let the server answer 304 if the data we have is still current
+                const etag = localStorage.getItem('eonapi_meter_data_etag');
+                if (this.meterData && etag) {
+                    headers['If-None-Match'] = etag;
+                }
+
+                const response = await fetch('/api/meter-data', {
+                    method: 'POST',
+                    headers: headers,
+                    body: JSON.stringify(this.credentials)
+                });
+
+                if (response.status === 304) {
+                    return;
+                }
+
+                if (!response.ok) {
+                    const error = await response.json();
+                    throw new Error(error.detail || 'Failed to fetch data');
+                }
+
+                // Keep the response text so it can be stored without
+                // serializing the parsed data again
+                const body = await response.text();
+                this.meterData = JSON.parse(body);
+                this.isAuthenticated = true;
+
+                // Save to localStorage
+                localStorage.setItem('eonapi_meter_data', body);
+                localStorage.setItem('eonapi_credentials', JSON.stringify(this.credentials));
+                localStorage.setItem('eonapi_meter_data_etag', response.headers.get('ETag') || '');
+
+                // Wait for DOM update before creating charts
+                await this.$nextTick();
+                await this.createCharts();
+            } catch (err) {
+                this.error = err.message;
+            } finally {
+                this.loading = false;
+            }
+        },
+
+        async refreshData() {
+            // Re-fetch data using stored credentials
+            await this.handleLogin();
+        },
+
+        logout() {
+            // Destroy chart first
+            if (this.mainChart) {
+                this.mainChart.destroy();
+                this.mainChart = null;
+            }
+
+            this.isAuthenticated = false;
+            this.meterData = null;
+            this.credentials.password = '';
+            this.selectedDay = null;
+
+            // Drop everything derived from the data so it can be freed
+            this.intervalValues = null;
+            this.dailyDataMap = markRaw(new Map());
+            this.sortedDates = [];
+
+            // Clear localStorage
+            localStorage.removeItem('eonapi_meter_data');
+            localStorage.removeItem('eonapi_credentials');
+            localStorage.removeItem('eonapi_meter_data_etag');
+        },
+
+        formatDate(dateStr) {
+            return cachedFormat('date:' + dateStr, () => new Date(dateStr).toLocaleDateString());
+        },
+
+        formatDateTime(dateStr) {
+            return cachedFormat('datetime:' + dateStr, () => new Date(dateStr).toLocaleString());
+        },
+
+        decodeFloat32(encoded) {
+            // Base64 of little-endian float32s, as sent by the server
+            const binary = atob(encoded);
+            const bytes = new Uint8Array(binary.length);
+            for (let i = 0; i < binary.length; i++) {
+                bytes[i] = binary.charCodeAt(i);
+            }
+            return new Float32Array(bytes.buffer);
+        },
+
+        formatDay(day) {
+            return cachedFormat('day:' + day, () => {
+                // Days are YYYY-MM-DD; build a local date so the day doesn't shift
+                const [year, month, date] = day.split('-').map(Number);
+                return new Date(year, month - 1, date).toLocaleDateString();
+            });
+        },
+
+        async createCharts() {
+            this.intervalValues = this.decodeFloat32(this.meterData.values_f32);
+
+            // Days arrive in order with their totals and where their
+            // intervals sit in the times and values columns
+            // Build the lookup in one pass and keep it out of Vue's reactive
+            // proxies, since the template never reads it
+            const days = this.meterData.days;
+            const dailyDataMap = new Map();
+            const sortedDates = new Array(days.length);
+            for (let i = 0; i < days.length; i++) {
+                const [date, total, first, count] = days[i];
+                dailyDataMap.set(date, { total, first, count });
+                sortedDates[i] = date;
+            }
+            this.dailyDataMap = markRaw(dailyDataMap);
+            this.sortedDates = sortedDates;
+
+            await this.createDailyChart();
+        },
+
+        async createDailyChart() {
+            // Destroy existing chart if any
+            if (this.mainChart) {
+                this.mainChart.destroy();
+                this.mainChart = null;
+            }
+
+            const dates = this.sortedDates;
+            // The map keeps the days in date order, so one walk fills the series
+            const values = new Array(this.dailyDataMap.size);
+            let i = 0;
+            for (const day of this.dailyDataMap.values()) {
+                values[i++] = day.total;
+            }
+            // Every bar and rotated label is its own SVG node, so long ranges
+            // drop rounded corners, grid lines and animation, and label only
+            // some of the days
+            const large = dates.length > LARGE_CHART_BARS;
+
+            const options = {
+                series: [{
+                    name: 'Daily Consumption',
+                    data: values
+                }],
+                chart: {
+                    type: 'bar',
+                    height: 400,
+                    animations: {
+                        enabled: !large,
+                        speed: 200,
+                        animateGradually: {
+                            enabled: false
+                        }
+                    },
+                    redrawOnParentResize: !large,
+                    redrawOnWindowResize: !large,
+                    events: {
+                        dataPointSelection: (event, chartContext, config) => {
+                            const selectedDate = dates[config.dataPointIndex];
+                            this.showDayDetails(selectedDate);
+                        }
+                    },
+                    toolbar: {
+                        show: false
+                    }
+                },
+                plotOptions: {
+                    bar: {
+                        borderRadius: large ? 0 : 4,
+                        dataLabels: large ? {} : {
+                            position: 'top'
+                        }
+                    }
+                },
+                dataLabels: {
+                    enabled: false
+                },
+                xaxis: {
+                    categories: dates.map(date => this.formatDay(date)),
+                    tickPlacement: 'on',
+                    tickAmount: large ? 30 : undefined,
+                    labels: {
+                        rotate: -45,
+                        rotateAlways: true
+                    }
+                },
+                yaxis: {
+                    title: {
+                        text: 'Consumption (kWh)'
+                    },
+                    labels: {
+                        formatter: (val) => kwh2.format(val)
+                    }
+                },
+                tooltip: {
+                    shared: false,
+                    y: {
+                        formatter: (val) => `${kwh2.format(val)} kWh`
+                    }
+                },
+                grid: {
+                    show: !large
+                },
+                colors: ['#6B9BD1'],
+                fill: {
+                    opacity: 0.85
+                }
+            };
+
+            this.mainChart = new ApexCharts(document.querySelector("#mainChart"), options);
+            await this.mainChart.render();
+        },
+
+        async showDayDetails(date) {
+            const dayData = this.dailyDataMap.get(date);
+
+            if (!dayData || dayData.count === 0) {
+                console.error('No data available for date:', date);
+                return;
+            }
+
+            // Intervals arrive in time order with HH:MM labels
+            const end = dayData.first + dayData.count;
+            const labels = this.meterData.times.slice(dayData.first, end);
+            const values = Array.from(this.intervalValues.subarray(dayData.first, end));
+
+            // Update selected day
+            this.selectedDay = date;
+
+            // Destroy and recreate chart
+            if (this.mainChart) {
+                this.mainChart.destroy();
+                this.mainChart = null;
+            }
+
+            await this.$nextTick();
+
+            const options = {
+                series: [{
+                    name: 'Half-hourly Consumption',
+                    data: values
+                }],
+                chart: {
+                    type: 'bar',
+                    height: 400,
+                    animations: {
+                        enabled: true,
+                        speed: 200,
+                        animateGradually: {
+                            enabled: false
+                        }
+                    },
+                    toolbar: {
+                        show: false
+                    }
+                },
+                plotOptions: {
+                    bar: {
+                        borderRadius: 4,
+                        dataLabels: {
+                            position: 'top'
+                        }
+                    }
+                },
+                dataLabels: {
+                    enabled: false
+                },
+                xaxis: {
+                    categories: labels,
+                    labels: {
+                        rotate: -45,
+                        rotateAlways: true
+                    }
+                },
+                yaxis: {
+                    title: {
+                        text: 'Consumption (kWh)'
+                    },
+                    labels: {
+                        formatter: (val) => kwh3.format(val)
+                    }
+                },
+                tooltip: {
+                    y: {
+                        formatter: (val) => `${kwh3.format(val)} kWh`
+                    }
+                },
+                colors: ['#9B87C4'],
+                fill: {
+                    opacity: 0.85
+                }
+            };
+
+            this.mainChart = new ApexCharts(document.querySelector("#mainChart"), options);
+            await this.mainChart.render();
+        },
+
+        async backToDaily() {
+            this.selectedDay = null;
+            await this.createDailyChart();
+        },
+
+        hasPreviousDay() {
+            if (!this.selectedDay || this.sortedDates.length === 0) return false;
+            const currentIndex = this.sortedDates.indexOf(this.selectedDay);
+            return currentIndex > 0;
+        },
+
+        hasNextDay() {
+            if (!this.selectedDay || this.sortedDates.length === 0) return false;
+            const currentIndex = this.sortedDates.indexOf(this.selectedDay);
+            return currentIndex < this.sortedDates.length - 1;
+        },
+
+        async showPreviousDay() {
+            if (!this.hasPreviousDay()) return;
+            const currentIndex = this.sortedDates.indexOf(this.selectedDay);
+            const previousDate = this.sortedDates[currentIndex - 1];
+            await this.showDayDetails(previousDate);
+        },
+
+        async showNextDay() {
+            if (!this.hasNextDay()) return;
+            const currentIndex = this.sortedDates.indexOf(this.selectedDay);
+            const nextDate = this.sortedDates[currentIndex + 1];
+            await this.showDayDetails(nextDate);
+        }
+    }
+}).mount('#app');
@@ -0,0 +1,56 @@
+"""Consumption statistics shared by the CLI and the web server."""
+
+from .api import parse_timestamp
+
+# Number of half-hour intervals in a day
+INTERVALS_PER_DAY = 48
+
+
+def summarize(records: list[dict]) -> tuple[float, float, str]:
+    """Get total and peak consumption, parsing each value once.
+
+    Args:
+        records: Consumption records with startAt and value fields
+
+    Returns:
+        Tuple of (total_kwh, peak_kwh, peak_time). If several intervals share the
+        peak value the earliest is used; peak_time is empty if there are no records.
+    """
+    # Parse in one comprehension, then leave the arithmetic to builtins, which
+    # loop in C. index() finds the earliest peak
+    values = [float(record.get("value", 0)) for record in records]
+    if not values:
+        return 0.0, 0.0, ""
+
+    peak_kwh = max(values)
+    peak_time = records[values.index(peak_kwh)].get("startAt", "")
+    return sum(values), peak_kwh, peak_time
+
+
+def columns_by_day(
+    records: list[dict]
+) -> tuple[list[str], list[float], list[tuple[str, float, int, int]]]:
+    """Split records into time-ordered columns, indexed by day.
+
+    The API gives timestamps in UK local time, so the date part of startAt is
+    the local day without any further conversion.
+
+    Args:
+        records: Consumption records with startAt and value fields
+
+    Returns:
+        Tuple of (start_ats, values, days). days has a (date, total_kwh,
+        first_index, count) entry for each YYYY-MM-DD date in order, giving the
+        slice of start_ats and values that falls on it.
+    """
+    ordered = sorted(records, key=lambda record: parse_timestamp(record["startAt"]))
+    start_ats = [record["startAt"] for record in ordered]
+    values = [float(record["value"]) for record in ordered]
+
+    days = []
+    first = 0
+    for i in range(1, len(start_ats) + 1):
+        if i == len(start_ats) or start_ats[i][:10] != start_ats[first][:10]:
+            days.append((start_ats[first][:10], sum(values[first:i]), first, i - first))
+            first = i
+    return start_ats, values, days
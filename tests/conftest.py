@@ -0,0 +1,46 @@
+"""Shared test configuration."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from click.testing import CliRunner
+
+
+@pytest.fixture(autouse=True)
+def isolated_meter_cache(tmp_path, monkeypatch):
+    """Keep the CLI's on-disk meter cache out of the user's home directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+
+@pytest.fixture(scope="module")
+def runner():
+    """Create one CLI runner for the module; each invoke captures its own output."""
+    return CliRunner()
+
+
+@pytest.fixture
+def mock_api():
+    """Mock the EonNextAPI used by the CLI, with a single electricity meter."""
+    with patch("eonapi.cli.EonNextAPI") as mock_api_class:
+        mock_api_instance = AsyncMock()
+        mock_api_class.return_value = mock_api_instance
+
+        mock_api_instance.login.return_value = True
+        mock_api_instance.get_account_numbers.return_value = ["ACC123"]
+        mock_api_instance.get_meters.return_value = [
+            {
+                "type": "electricity",
+                "serial": "METER123",
+                "id": "meter-id-123",
+                "meter_point_id": "mp-123",
+                "mpan": "1234567890",
+            }
+        ]
+
+        # Serve the mocked consumption data as a single page
+        async def iter_consumption_data(*args, **kwargs):
+            yield await mock_api_instance.get_consumption_data(*args, **kwargs)
+
+        mock_api_instance.iter_consumption_data = iter_consumption_data
+
+        yield mock_api_instance
@@ -0,0 +1,118 @@
+"""Tests for the API client."""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+
+from eonapi.api import EonNextAPI, parse_timestamp
+
+BST = timezone(timedelta(hours=1))
+
+
+def consumption_handler(request):
+    """Serve half-hourly consumption pages from the requested start date."""
+    variables = json.loads(request.content)["variables"]
+    start = datetime.fromisoformat(variables["startDate"])
+    offset = int(variables.get("after") or 0)
+
+    edges = []
+    for i in range(100):
+        interval_start = (start + timedelta(minutes=30 * (offset + i))).astimezone(BST)
+        edges.append({"node": {
+            "startAt": interval_start.isoformat(),
+            "endAt": (interval_start + timedelta(minutes=30)).isoformat(),
+            "value": "0.5",
+        }})
+
+    return httpx.Response(200, json={"data": {"account": {"electricityAgreements": [{
+        "meterPoint": {"meters": [{
+            "id": "meter-id-123",
+            "consumption": {
+                "edges": edges,
+                "pageInfo": {"hasNextPage": True, "endCursor": str(offset + 100)},
+            },
+        }]},
+    }]}}})
+
+
+@pytest.fixture
+def api():
+    """API client authenticated against a mocked consumption endpoint."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(consumption_handler))
+    api = EonNextAPI(client=client)
+    api.auth_token = "token"
+    api.token_expires = 2**31
+    return api
+
+
+def fetch(api, concurrency):
+    return asyncio.run(api.get_consumption_data(
+        account_number="ACC123",
+        meter_id="meter-id-123",
+        meter_type="electricity",
+        start_date=datetime(2024, 6, 1),
+        end_date=datetime(2024, 6, 10, 12),
+        concurrency=concurrency
+    ))
+
+
+class TestConsumptionPagination:
+    """Test suite for consumption data pagination."""
+
+    def test_serial_pagination(self, api):
+        """Test that pages are fetched up to the end date."""
+        records = fetch(api, concurrency=1)
+
+        assert records[0]["startAt"] == "2024-06-01T01:00:00+01:00"
+        assert records[-1]["startAt"] == "2024-06-10T11:30:00+01:00"
+        assert len(records) == len({record["startAt"] for record in records})
+
+    def test_parallel_windows_match_serial(self, api):
+        """Test that splitting into windows returns the same ordered records."""
+        serial = fetch(api, concurrency=1)
+        parallel = fetch(api, concurrency=4)
+
+        assert parallel == serial
+
+    def test_failed_first_window_cleans_up(self):
+        """Test that later windows are cancelled and awaited if the first fails."""
+        first_start = datetime(2024, 6, 1).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+
+        def handler(request):
+            if json.loads(request.content)["variables"]["startDate"] == first_start:
+                return httpx.Response(500, json={"errors": [{"message": "boom"}]})
+            return consumption_handler(request)
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        api = EonNextAPI(client=client)
+        api.auth_token = "token"
+        api.token_expires = 2**31
+
+        async def run():
+            with pytest.raises(Exception, match="boom"):
+                await api.get_consumption_data(
+                    account_number="ACC123",
+                    meter_id="meter-id-123",
+                    meter_type="electricity",
+                    start_date=datetime(2024, 6, 1),
+                    end_date=datetime(2024, 6, 10, 12),
+                    concurrency=4
+                )
+            return asyncio.all_tasks() - {asyncio.current_task()}
+
+        assert asyncio.run(run()) == set()
+
+
+class TestToUtc:
+    """Test suite for parsing API timestamps."""
+
+    def test_offsets_and_z_suffix(self):
+        """Test that offsets, a Z suffix and naive timestamps all parse."""
+        expected = datetime(2024, 6, 1, 0, 0, tzinfo=timezone.utc)
+
+        assert parse_timestamp("2024-06-01T01:00:00+01:00") == expected
+        assert parse_timestamp("2024-06-01T00:00:00Z") == expected
+        assert parse_timestamp("2024-06-01T00:00:00") == expected
@@ -0,0 +1,157 @@
+"""Tests for the stats command."""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from eonapi.cli import cli
+from eonapi.database import ConsumptionDatabase
+
+
+class TestStats:
+    """Test suite for the stats command."""
+
+    def test_stats_totals_and_peak(self, mock_api, runner):
+        """Test total, average and peak calculations."""
+        mock_api.get_consumption_data.return_value = [
+            {"startAt": "2024-01-01T00:00:00+00:00", "endAt": "2024-01-01T00:30:00+00:00", "value": "0.5"},
+            {"startAt": "2024-01-01T00:30:00+00:00", "endAt": "2024-01-01T01:00:00+00:00", "value": "2.0"},
+            {"startAt": "2024-01-01T01:00:00+00:00", "endAt": "2024-01-01T01:30:00+00:00", "value": "2.0"},
+            {"startAt": "2024-01-01T01:30:00+00:00", "endAt": "2024-01-01T02:00:00+00:00", "value": "1.5"},
+        ]
+
+        result = runner.invoke(
+            cli,
+            ["stats", "--username", "test@example.com", "--password", "testpass"],
+            catch_exceptions=False
+        )
+
+        assert result.exit_code == 0
+        assert "Total Consumption: 6.00 kWh" in result.output
+        assert "Average per interval: 1.500 kWh" in result.output
+        assert "Peak Usage: 2.00 kWh" in result.output
+        # Ties keep the earliest interval
+        assert "Peak Time: 2024-01-01T00:30:00+00:00" in result.output
+
+    def test_stats_no_data(self, mock_api, runner):
+        """Test stats with no consumption data."""
+        mock_api.get_consumption_data.return_value = []
+
+        result = runner.invoke(
+            cli,
+            ["stats", "--username", "test@example.com", "--password", "testpass"],
+            catch_exceptions=False
+        )
+
+        assert result.exit_code == 0
+        assert "No consumption data available for analysis." in result.output
+
+    def test_stats_from_database(self, tmp_path, mock_api, runner):
+        """Test that --db stores fetched data and aggregates it in SQLite."""
+        mock_api.get_consumption_data.return_value = [
+            {"startAt": "2024-01-01T00:00:00+00:00", "endAt": "2024-01-01T00:30:00+00:00", "value": "0.5"},
+            {"startAt": "2024-01-01T00:30:00+00:00", "endAt": "2024-01-01T01:00:00+00:00", "value": "2.0"},
+            {"startAt": "2024-01-01T01:00:00+00:00", "endAt": "2024-01-01T01:30:00+00:00", "value": "2.0"},
+            {"startAt": "2024-01-01T01:30:00+00:00", "endAt": "2024-01-01T02:00:00+00:00", "value": "1.5"},
+        ]
+        db_path = tmp_path / "eon-data.db"
+
+        result = runner.invoke(
+            cli,
+            [
+                "stats",
+                "--username", "test@example.com",
+                "--password", "testpass",
+                "--days", "10000",
+                "--db", str(db_path),
+            ],
+            catch_exceptions=False
+        )
+
+        assert result.exit_code == 0
+        assert db_path.exists()
+        assert "Period: 10000 days (4 half-hour intervals)" in result.output
+        assert "Total Consumption: 6.00 kWh" in result.output
+        assert "Peak Usage: 2.00 kWh" in result.output
+        assert "Peak Time: 2024-01-01T00:30:00+00:00" in result.output
+
+    def test_stats_from_database_backfills(self, tmp_path, mock_api, runner):
+        """Test that --db fetches the days the database doesn't cover yet."""
+        # Five days of hourly readings ending before now
+        last = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+        records = [
+            {
+                "startAt": (last - timedelta(hours=hour)).isoformat(),
+                "endAt": (last - timedelta(hours=hour, minutes=-30)).isoformat(),
+                "value": "1.0",
+            }
+            for hour in range(5 * 24 - 2, -1, -1)
+        ]
+        mock_api.get_consumption_data.return_value = records
+        db_path = tmp_path / "eon-data.db"
+
+        # The database only has the last two days
+        with ConsumptionDatabase(db_path) as database:
+            database.store_records(records[-48:], "METER123", "electricity")
+
+        result = runner.invoke(
+            cli,
+            [
+                "stats",
+                "--username", "test@example.com",
+                "--password", "testpass",
+                "--days", "5",
+                "--db", str(db_path),
+            ],
+            catch_exceptions=False
+        )
+
+        assert result.exit_code == 0
+        start_date = mock_api.get_consumption_data.call_args.kwargs["start_date"]
+        expected_start = datetime.now() - timedelta(days=5)
+        assert abs(start_date - expected_start) < timedelta(minutes=1)
+        assert f"Period: 5 days ({len(records)} half-hour intervals)" in result.output
+        assert f"Total Consumption: {len(records):.2f} kWh" in result.output
+
+    def test_stats_from_database_window(self, tmp_path, mock_api, runner, monkeypatch):
+        """Test that the --db window ends at now in UTC, whatever the local timezone."""
+        frozen_now = datetime(2024, 1, 2, 1, 0, tzinfo=timezone.utc)
+
+        class FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                if tz is None:
+                    return frozen_now.astimezone().replace(tzinfo=None)
+                return frozen_now.astimezone(tz)
+
+        mock_api.get_consumption_data.return_value = [
+            {"startAt": "2024-01-01T00:00:00+00:00", "endAt": "2024-01-01T00:30:00+00:00", "value": "0.5"},
+            {"startAt": "2024-01-01T00:30:00+00:00", "endAt": "2024-01-01T01:00:00+00:00", "value": "2.0"},
+            {"startAt": "2024-01-01T01:00:00+00:00", "endAt": "2024-01-01T01:30:00+00:00", "value": "2.0"},
+            {"startAt": "2024-01-01T01:30:00+00:00", "endAt": "2024-01-01T02:00:00+00:00", "value": "1.5"},
+        ]
+        monkeypatch.setattr("eonapi.cli.datetime", FrozenDatetime)
+        # A naive local window would start five hours early here
+        with monkeypatch.context() as m:
+            m.setenv("TZ", "America/New_York")
+            time.tzset()
+            try:
+                result = runner.invoke(
+                    cli,
+                    [
+                        "stats",
+                        "--username", "test@example.com",
+                        "--password", "testpass",
+                        "--days", "1",
+                        "--db", str(tmp_path / "eon-data.db"),
+                    ],
+                    catch_exceptions=False
+                )
+            finally:
+                m.undo()
+                time.tzset()
+
+        # The window starts at 2024-01-01T01:00Z, inclusive
+        assert result.exit_code == 0
+        assert "(2 half-hour intervals)" in result.output
+        assert "Total Consumption: 3.50 kWh" in result.output
+        assert "Peak Time: 2024-01-01T01:00:00+00:00" in result.output
@@ -3,10 +3,8 @@
 import os
 import tempfile
 from datetime import datetime, timedelta
-from unittest.mock import AsyncMock, patch
 
 import pytest
-from click.testing import CliRunner
 
 from eonapi.cli import cli
 from eonapi.database import ConsumptionDatabase
@@ -18,14 +16,15 @@ def temp_db():
     fd, path = tempfile.mkstemp(suffix=".db")
     os.close(fd)
     yield path
-    # Cleanup
-    if os.path.exists(path):
-        os.unlink(path)
+    # Cleanup, including the WAL sidecar files
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_consumption_data():
-    """Create sample consumption data."""
+    """Create one day of sample consumption data, shared by all tests."""
     base_time = datetime(2024, 1, 1, 0, 0, 0)
     data = []
 
@@ -33,8 +32,8 @@ def sample_consumption_data():
         start_time = base_time + timedelta(minutes=30 * i)
         end_time = start_time + timedelta(minutes=30)
         data.append({
-            "startAt": start_time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
-            "endAt": end_time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+            "startAt": start_time.isoformat() + "+00:00",
+            "endAt": end_time.isoformat() + "+00:00",
             "value": 0.5 + (i * 0.01)
         })
 
@@ -42,41 +41,17 @@ def sample_consumption_data():
 
 
 @pytest.fixture
-def mock_api():
-    """Mock the EonNextAPI."""
-    with patch("eonapi.cli.EonNextAPI") as mock_api_class:
-        mock_api_instance = AsyncMock()
-        mock_api_class.return_value = mock_api_instance
-
-        # Mock login
-        mock_api_instance.login.return_value = True
-
-        # Mock account numbers
-        mock_api_instance.get_account_numbers.return_value = ["ACC123"]
-
-        # Mock meters
-        mock_api_instance.get_meters.return_value = [
-            {
-                "type": "electricity",
-                "serial": "METER123",
-                "id": "meter-id-123",
-                "meter_point_id": "mp-123",
-                "mpan": "1234567890",
-            }
-        ]
-
-        yield mock_api_instance
+def mock_api(mock_api, sample_consumption_data):
+    """Mock the EonNextAPI, serving the sample consumption data by default."""
+    mock_api.get_consumption_data.return_value = sample_consumption_data
+    return mock_api
 
 
 class TestExportStore:
     """Test suite for export --store functionality."""
 
-    def test_export_store_initial_load(self, temp_db, sample_consumption_data, mock_api):
+    def test_export_store_initial_load(self, temp_db, mock_api, runner):
         """Test initial data load with --store option."""
-        # Mock consumption data
-        mock_api.get_consumption_data.return_value = sample_consumption_data
-
-        runner = CliRunner()
         result = runner.invoke(
             cli,
             [
@@ -98,17 +73,13 @@ class TestExportStore:
         db = ConsumptionDatabase(temp_db)
         assert db.get_record_count("METER123") == 48
 
-    def test_export_store_incremental_update(self, temp_db, sample_consumption_data, mock_api):
+    def test_export_store_incremental_update(self, temp_db, sample_consumption_data, mock_api, runner):
         """Test incremental update with existing data."""
         # Store initial data
         db = ConsumptionDatabase(temp_db)
         initial_data = sample_consumption_data[:24]  # First 12 hours
         db.store_records(initial_data, "METER123", "electricity")
 
-        # Mock API to return overlapping + new data
-        mock_api.get_consumption_data.return_value = sample_consumption_data
-
-        runner = CliRunner()
         result = runner.invoke(
             cli,
             [
@@ -128,16 +99,12 @@ class TestExportStore:
         # Should have 48 total records (24 initial + 24 new)
         assert db.get_record_count("METER123") == 48
 
-    def test_export_store_no_duplicates(self, temp_db, sample_consumption_data, mock_api):
+    def test_export_store_no_duplicates(self, temp_db, sample_consumption_data, mock_api, runner):
         """Test that duplicate records are not inserted."""
         # Store data first time
         db = ConsumptionDatabase(temp_db)
         db.store_records(sample_consumption_data, "METER123", "electricity")
 
-        # Mock API to return same data
-        mock_api.get_consumption_data.return_value = sample_consumption_data
-
-        runner = CliRunner()
         result = runner.invoke(
             cli,
             [
@@ -157,15 +124,12 @@ class TestExportStore:
         # Should still have 48 records
         assert db.get_record_count("METER123") == 48
 
-    def test_export_store_custom_db_path(self, sample_consumption_data, mock_api):
+    def test_export_store_custom_db_path(self, mock_api, runner):
         """Test using custom database path."""
-        mock_api.get_consumption_data.return_value = sample_consumption_data
-
         # Use a custom path in temp directory
         with tempfile.TemporaryDirectory() as tmpdir:
             custom_db = os.path.join(tmpdir, "custom-eon.db")
 
-            runner = CliRunner()
             result = runner.invoke(
                 cli,
                 [
@@ -185,11 +149,8 @@ class TestExportStore:
             db = ConsumptionDatabase(custom_db)
             assert db.get_record_count("METER123") == 48
 
-    def test_export_without_store_still_works(self, sample_consumption_data, mock_api):
+    def test_export_without_store_still_works(self, mock_api, runner):
         """Test that export without --store still works (CSV output)."""
-        mock_api.get_consumption_data.return_value = sample_consumption_data
-
-        runner = CliRunner()
         result = runner.invoke(
             cli,
             [
@@ -205,17 +166,35 @@ class TestExportStore:
         assert "interval_start,interval_end,consumption_kwh" in result.output
         assert "Successfully exported 48 records" in result.output
 
+    def test_export_to_output_file(self, tmp_path, sample_consumption_data, mock_api, runner):
+        """Test that buffered CSV output is fully written to --output."""
+        output_path = tmp_path / "out.csv"
+
+        result = runner.invoke(
+            cli,
+            [
+                "export",
+                "--username", "test@example.com",
+                "--password", "testpass",
+                "--output", str(output_path),
+            ],
+            catch_exceptions=False
+        )
+
+        assert result.exit_code == 0
+        lines = output_path.read_text().splitlines()
+        assert lines[0] == "interval_start,interval_end,consumption_kwh"
+        assert len(lines) == 49
+        assert lines[-1].startswith(sample_consumption_data[-1]["startAt"])
+
     def test_export_store_with_credentials_from_env(
-        self, temp_db, sample_consumption_data, mock_api, monkeypatch
+        self, temp_db, mock_api, monkeypatch, runner
     ):
         """Test --store with credentials from environment variables."""
         # Set environment variables
         monkeypatch.setenv("EON_USERNAME", "test@example.com")
         monkeypatch.setenv("EON_PASSWORD", "testpass")
 
-        mock_api.get_consumption_data.return_value = sample_consumption_data
-
-        runner = CliRunner()
         result = runner.invoke(
             cli,
             ["export", "--store", "--db", temp_db],
@@ -225,7 +204,7 @@ class TestExportStore:
         assert result.exit_code == 0
         assert "Database updated" in result.output
 
-    def test_latest_interval_detection(self, temp_db, sample_consumption_data, mock_api):
+    def test_latest_interval_detection(self, temp_db, sample_consumption_data, mock_api, runner):
         """Test that the latest interval is correctly detected and used."""
         # Store initial data
         db = ConsumptionDatabase(temp_db)
@@ -238,7 +217,6 @@ class TestExportStore:
         # Mock new data
         mock_api.get_consumption_data.return_value = sample_consumption_data[5:]
 
-        runner = CliRunner()
         result = runner.invoke(
             cli,
             [
@@ -254,3 +232,22 @@ class TestExportStore:
         assert result.exit_code == 0
         assert "Found existing data up to" in result.output
         assert "Fetching incremental data" in result.output
+
+    def test_meters_cached_between_runs(self, temp_db, mock_api, runner):
+        """Test that account and meter lookups are reused on the next run."""
+        args = [
+            "export",
+            "--username", "test@example.com",
+            "--password", "testpass",
+            "--store",
+            "--db", temp_db,
+        ]
+        first = runner.invoke(cli, args, catch_exceptions=False)
+        second = runner.invoke(cli, args, catch_exceptions=False)
+
+        assert first.exit_code == 0
+        assert second.exit_code == 0
+        assert "Using account: ACC123 (cached)" in second.output
+        assert mock_api.login.call_count == 2
+        assert mock_api.get_account_numbers.call_count == 1
+        assert mock_api.get_meters.call_count == 1
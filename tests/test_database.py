@@ -1,12 +1,13 @@
 """Tests for the database module."""
 
 import os
+import sqlite3
 import tempfile
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from eonapi.database import ConsumptionDatabase
+from eonapi.database import ConsumptionDatabase, _records_query
 
 
 @pytest.fixture
@@ -15,14 +16,23 @@ def temp_db():
     fd, path = tempfile.mkstemp(suffix=".db")
     os.close(fd)
     yield path
-    # Cleanup
-    if os.path.exists(path):
-        os.unlink(path)
+    # Cleanup, including the WAL sidecar files
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
 
 
 @pytest.fixture
+def mem_db():
+    """Create an in-memory database for tests that don't need a file."""
+    db = ConsumptionDatabase(":memory:")
+    yield db
+    db.close()
+
+
+@pytest.fixture(scope="session")
 def sample_records():
-    """Create sample consumption records for testing."""
+    """Create sample consumption records, shared by all tests and never modified."""
     base_time = datetime(2024, 1, 1, 0, 0, 0)
     records = []
 
@@ -50,11 +60,15 @@ class TestConsumptionDatabase:
         count = db.get_record_count()
         assert count == 0
 
-    def test_store_records(self, temp_db, sample_records):
-        """Test storing records in the database."""
-        db = ConsumptionDatabase(temp_db)
+    def test_wal_mode_enabled(self, temp_db):
+        """Test that the database is opened in WAL journal mode."""
+        with ConsumptionDatabase(temp_db) as db:
+            mode = db._conn.execute("PRAGMA journal_mode").fetchone()[0]
+            assert mode == "wal"
 
-        inserted, skipped = db.store_records(
+    def test_store_records(self, mem_db, sample_records):
+        """Test storing records in the database."""
+        inserted, skipped = mem_db.store_records(
             sample_records,
             meter_serial="TEST123",
             meter_type="electricity"
@@ -62,14 +76,12 @@ class TestConsumptionDatabase:
 
         assert inserted == 10
         assert skipped == 0
-        assert db.get_record_count("TEST123") == 10
+        assert mem_db.get_record_count("TEST123") == 10
 
-    def test_duplicate_records_skipped(self, temp_db, sample_records):
+    def test_duplicate_records_skipped(self, mem_db, sample_records):
         """Test that duplicate records are skipped."""
-        db = ConsumptionDatabase(temp_db)
-
         # Insert records first time
-        inserted1, skipped1 = db.store_records(
+        inserted1, skipped1 = mem_db.store_records(
             sample_records,
             meter_serial="TEST123",
             meter_type="electricity"
@@ -78,7 +90,7 @@ class TestConsumptionDatabase:
         assert skipped1 == 0
 
         # Try to insert same records again
-        inserted2, skipped2 = db.store_records(
+        inserted2, skipped2 = mem_db.store_records(
             sample_records,
             meter_serial="TEST123",
             meter_type="electricity"
@@ -87,34 +99,124 @@ class TestConsumptionDatabase:
         assert skipped2 == 10
 
         # Total count should still be 10
-        assert db.get_record_count("TEST123") == 10
-
-    def test_get_latest_interval(self, temp_db, sample_records):
+        assert mem_db.get_record_count("TEST123") == 10
+
+    def test_known_intervals_filtered_before_insert(self, mem_db, sample_records):
+        """Test that stored intervals are skipped, whatever order records arrive in."""
+        mem_db.store_records(sample_records[2:8], "TEST123", "electricity")
+
+        # A page that is all duplicates makes no changes at all
+        changes = mem_db._conn.total_changes
+        assert mem_db.store_records(sample_records[2:8], "TEST123", "electricity") == (0, 6)
+        assert mem_db._conn.total_changes == changes
+
+        # Out-of-order records outside the first-to-last range still dedupe
+        shuffled = sample_records[5:] + sample_records[:5]
+        assert mem_db.store_records(shuffled, "TEST123", "electricity") == (4, 6)
+        assert mem_db.get_record_count("TEST123") == 10
+
+    def test_store_records_across_batches(self, mem_db):
+        """Test counts when records span several INSERT statements."""
+        base_time = datetime(2024, 1, 1)
+        records = [
+            {
+                "startAt": (base_time + timedelta(minutes=30 * i)).isoformat(),
+                "endAt": (base_time + timedelta(minutes=30 * (i + 1))).isoformat(),
+                "value": 0.1,
+            }
+            for i in range(250)
+        ]
+
+        assert mem_db.store_records(records[:120], "TEST123", "electricity") == (120, 0)
+        assert mem_db.store_records(records, "TEST123", "electricity") == (130, 120)
+        assert mem_db.get_record_count("TEST123") == 250
+
+    def test_deferred_indexes(self, mem_db, sample_records):
+        """Test that an initial load rebuilds the secondary index afterwards."""
+        def index_names():
+            return {
+                row[0] for row in mem_db._conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+                )
+            }
+
+        with mem_db.deferred_indexes():
+            assert index_names() == set()
+            mem_db.store_records(sample_records, "TEST123", "electricity")
+            # Duplicates are still caught by the UNIQUE constraint
+            assert mem_db.store_records(sample_records, "TEST123", "electricity") == (0, 10)
+
+        assert index_names() == {"idx_consumption_meter_start_ts"}
+        assert mem_db.get_latest_interval("TEST123") == sample_records[-1]["startAt"]
+
+        # With existing data the index is left in place
+        with mem_db.deferred_indexes():
+            assert index_names() == {"idx_consumption_meter_start_ts"}
+
+    def test_get_latest_interval(self, mem_db, sample_records):
         """Test getting the latest interval for a meter."""
-        db = ConsumptionDatabase(temp_db)
-
         # No data yet
-        assert db.get_latest_interval("TEST123") is None
+        assert mem_db.get_latest_interval("TEST123") is None
 
         # Store records
-        db.store_records(
+        mem_db.store_records(
             sample_records,
             meter_serial="TEST123",
             meter_type="electricity"
         )
 
         # Get latest interval
-        latest = db.get_latest_interval("TEST123")
+        latest = mem_db.get_latest_interval("TEST123")
         assert latest is not None
         assert latest == sample_records[-1]["startAt"]
 
-    def test_incremental_updates(self, temp_db, sample_records):
-        """Test incremental data updates."""
-        db = ConsumptionDatabase(temp_db)
+    def test_latest_interval_across_clock_change(self, mem_db):
+        """Test that the latest interval is found by time, not string order."""
+        records = [
+            # 00:30 UTC, then 01:00 UTC once the clocks have gone back
+            {"startAt": "2024-10-27T01:30:00+01:00", "endAt": "2024-10-27T01:00:00+00:00", "value": 0.1},
+            {"startAt": "2024-10-27T01:00:00+00:00", "endAt": "2024-10-27T01:30:00+00:00", "value": 0.2},
+        ]
+        mem_db.store_records(records, "TEST123", "electricity")
+
+        assert mem_db.get_latest_interval("TEST123") == "2024-10-27T01:00:00+00:00"
+        starts = [row["interval_start"] for row in mem_db.iter_records("TEST123")]
+        assert starts == [record["startAt"] for record in records]
+
+    def test_epoch_column_added_to_old_databases(self, temp_db):
+        """Test that databases without interval_start_ts are migrated on open."""
+        conn = sqlite3.connect(temp_db)
+        conn.execute("""
+            CREATE TABLE consumption (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                meter_serial TEXT NOT NULL,
+                meter_type TEXT NOT NULL,
+                interval_start TEXT NOT NULL,
+                interval_end TEXT NOT NULL,
+                consumption_kwh REAL NOT NULL,
+                created_at TEXT NOT NULL,
+                UNIQUE(meter_serial, interval_start)
+            )
+        """)
+        conn.execute(
+            "INSERT INTO consumption (meter_serial, meter_type, interval_start, "
+            "interval_end, consumption_kwh, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            ("TEST123", "electricity", "2024-06-01T00:30:00+01:00",
+             "2024-06-01T01:00:00+01:00", 0.5, "2024-06-02T00:00:00")
+        )
+        conn.commit()
+        conn.close()
+
+        with ConsumptionDatabase(temp_db) as db:
+            row = db.get_all_records("TEST123")[0]
+            expected = datetime(2024, 5, 31, 23, 30, tzinfo=timezone.utc)
+            assert row["interval_start_ts"] == int(expected.timestamp())
 
+    def test_incremental_updates(self, mem_db, sample_records):
+        """Test incremental data updates."""
         # Store first 5 records
         first_batch = sample_records[:5]
-        inserted1, skipped1 = db.store_records(
+        inserted1, skipped1 = mem_db.store_records(
             first_batch,
             meter_serial="TEST123",
             meter_type="electricity"
@@ -123,12 +225,12 @@ class TestConsumptionDatabase:
         assert skipped1 == 0
 
         # Get latest interval
-        latest = db.get_latest_interval("TEST123")
+        latest = mem_db.get_latest_interval("TEST123")
         assert latest == first_batch[-1]["startAt"]
 
         # Store next batch (including some overlap)
         second_batch = sample_records[3:]  # 2 duplicates + 5 new
-        inserted2, skipped2 = db.store_records(
+        inserted2, skipped2 = mem_db.store_records(
             second_batch,
             meter_serial="TEST123",
             meter_type="electricity"
@@ -137,58 +239,63 @@ class TestConsumptionDatabase:
         assert skipped2 == 2  # Duplicates skipped
 
         # Total should be 10
-        assert db.get_record_count("TEST123") == 10
+        assert mem_db.get_record_count("TEST123") == 10
 
-    def test_multiple_meters(self, temp_db, sample_records):
+    def test_multiple_meters(self, mem_db, sample_records):
         """Test storing data for multiple meters."""
-        db = ConsumptionDatabase(temp_db)
-
         # Store data for first meter
-        db.store_records(
+        mem_db.store_records(
             sample_records,
             meter_serial="ELEC123",
             meter_type="electricity"
         )
 
         # Store data for second meter (same timestamps, different meter)
-        db.store_records(
+        mem_db.store_records(
             sample_records,
             meter_serial="GAS456",
             meter_type="gas"
         )
 
         # Check counts
-        assert db.get_record_count("ELEC123") == 10
-        assert db.get_record_count("GAS456") == 10
-        assert db.get_record_count() == 20  # Total
+        assert mem_db.get_record_count("ELEC123") == 10
+        assert mem_db.get_record_count("GAS456") == 10
+        assert mem_db.get_record_count() == 20  # Total
 
         # Check latest intervals are independent
-        latest_elec = db.get_latest_interval("ELEC123")
-        latest_gas = db.get_latest_interval("GAS456")
+        latest_elec = mem_db.get_latest_interval("ELEC123")
+        latest_gas = mem_db.get_latest_interval("GAS456")
         assert latest_elec == sample_records[-1]["startAt"]
         assert latest_gas == sample_records[-1]["startAt"]
 
-    def test_get_all_records(self, temp_db, sample_records):
+    def test_get_all_records(self, mem_db, sample_records):
         """Test retrieving all records."""
-        db = ConsumptionDatabase(temp_db)
-
-        db.store_records(
+        mem_db.store_records(
             sample_records,
             meter_serial="TEST123",
             meter_type="electricity"
         )
 
         # Get all records
-        records = db.get_all_records("TEST123")
+        records = mem_db.get_all_records("TEST123")
         assert len(records) == 10
         assert records[0]["meter_serial"] == "TEST123"
         assert records[0]["meter_type"] == "electricity"
 
-    def test_get_records_with_date_filter(self, temp_db, sample_records):
-        """Test retrieving records with date filters."""
-        db = ConsumptionDatabase(temp_db)
+    def test_iter_records(self, mem_db, sample_records):
+        """Test streaming records in interval order."""
+        mem_db.store_records(
+            sample_records,
+            meter_serial="TEST123",
+            meter_type="electricity"
+        )
+
+        starts = [row["interval_start"] for row in mem_db.iter_records("TEST123")]
+        assert starts == [record["startAt"] for record in sample_records]
 
-        db.store_records(
+    def test_get_records_with_date_filter(self, mem_db, sample_records):
+        """Test retrieving records with date filters."""
+        mem_db.store_records(
             sample_records,
             meter_serial="TEST123",
             meter_type="electricity"
@@ -196,16 +303,51 @@ class TestConsumptionDatabase:
 
         # Filter by start date (middle of the range)
         start_date = datetime(2024, 1, 1, 2, 0, 0)
-        records = db.get_all_records("TEST123", start_date=start_date)
+        records = mem_db.get_all_records("TEST123", start_date=start_date)
 
-        # Should get records from 02:00 onwards (5 records)
-        assert len(records) >= 5
+        # Should get records from 02:00 onwards
+        assert len(records) == 6
+        assert records[0]["interval_start"] == "2024-01-01T02:00:00+00:00"
 
-    def test_empty_records_list(self, temp_db):
-        """Test handling empty records list."""
-        db = ConsumptionDatabase(temp_db)
+        # Both bounds are inclusive
+        records = mem_db.get_all_records(
+            "TEST123", start_date=start_date, end_date=datetime(2024, 1, 1, 3, 0, 0)
+        )
+        assert [row["interval_start"][11:16] for row in records] == ["02:00", "02:30", "03:00"]
+
+    def test_date_filter_uses_index(self, mem_db):
+        """Test that a meter's date range is read with an index range scan."""
+        # The same statement iter_records() and get_all_records() run
+        query, params = _records_query(
+            "TEST123", datetime(2024, 1, 1, 2, 0, 0), datetime(2024, 1, 1, 3, 0, 0)
+        )
+        plan = mem_db._conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
 
-        inserted, skipped = db.store_records(
+        details = " ".join(row[3] for row in plan)
+        assert "USING INDEX idx_consumption_meter_start_ts" in details
+        # Rows come out of the index in order, with no separate sort
+        assert "TEMP B-TREE" not in details
+
+    def test_compute_stats(self, mem_db, sample_records):
+        """Test aggregating totals and peak usage in SQL."""
+        mem_db.store_records(
+            sample_records,
+            meter_serial="TEST123",
+            meter_type="electricity"
+        )
+
+        total, count, peak, peak_time = mem_db.compute_stats("TEST123")
+        assert count == 10
+        assert total == pytest.approx(sum(r["value"] for r in sample_records))
+        assert peak == pytest.approx(1.4)
+        assert peak_time == sample_records[-1]["startAt"]
+
+        # Unknown meters have no peak
+        assert mem_db.compute_stats("OTHER") == (0, 0, None, None)
+
+    def test_empty_records_list(self, mem_db):
+        """Test handling empty records list."""
+        inserted, skipped = mem_db.store_records(
             [],
             meter_serial="TEST123",
             meter_type="electricity"
@@ -213,7 +355,7 @@ class TestConsumptionDatabase:
 
         assert inserted == 0
         assert skipped == 0
-        assert db.get_record_count("TEST123") == 0
+        assert mem_db.get_record_count("TEST123") == 0
 
     def test_database_persistence(self, temp_db, sample_records):
         """Test that data persists after closing and reopening database."""
@@ -224,12 +366,13 @@ class TestConsumptionDatabase:
             meter_serial="TEST123",
             meter_type="electricity"
         )
+        db1.close()
 
         # Create new instance and verify data exists
-        db2 = ConsumptionDatabase(temp_db)
-        assert db2.get_record_count("TEST123") == 10
-        latest = db2.get_latest_interval("TEST123")
-        assert latest == sample_records[-1]["startAt"]
+        with ConsumptionDatabase(temp_db) as db2:
+            assert db2.get_record_count("TEST123") == 10
+            latest = db2.get_latest_interval("TEST123")
+            assert latest == sample_records[-1]["startAt"]
 
     def test_default_database_path(self):
         """Test that default database path is created correctly."""
@@ -239,9 +382,10 @@ class TestConsumptionDatabase:
             os.unlink(default_path)
 
         try:
-            ConsumptionDatabase()
+            ConsumptionDatabase().close()
             assert os.path.exists(default_path)
         finally:
-            # Cleanup
-            if os.path.exists(default_path):
-                os.unlink(default_path)
+            # Cleanup, including the WAL sidecar files
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(default_path + suffix):
+                    os.unlink(default_path + suffix)
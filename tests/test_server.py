@@ -0,0 +1,282 @@
+"""Tests for the web UI server."""
+
+import asyncio
+import base64
+import time
+from array import array
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from eonapi import server
+from eonapi.server import app
+
+
+@pytest.fixture(scope="session")
+def sample_consumption_data():
+    """Create two days of sample consumption data, shared by all tests."""
+    return [
+        {
+            "startAt": f"2024-01-0{1 + i // 48}T{(i % 48) // 2:02d}:{30 * (i % 2):02d}:00+00:00",
+            "endAt": "",
+            "value": 0.5 if i != 60 else 2.5,
+        }
+        for i in range(96)
+    ]
+
+
+@pytest.fixture
+def mock_api(sample_consumption_data):
+    """Mock the EonNextAPI used by the server, with no sessions cached."""
+    server._sessions.clear()
+    server._responses.clear()
+    with patch("eonapi.server.EonNextAPI") as mock_api_class:
+        mock_api_instance = AsyncMock()
+        mock_api_class.return_value = mock_api_instance
+
+        mock_api_instance.login.return_value = True
+        mock_api_instance.token_expires = int(time.time()) + 3600
+        mock_api_instance.get_account_numbers.return_value = ["ACC123"]
+        mock_api_instance.get_meters.return_value = [
+            {"type": "electricity", "serial": "METER123", "id": "meter-id-123"}
+        ]
+        mock_api_instance.get_consumption_data.return_value = sample_consumption_data
+
+        yield mock_api_instance
+    server._sessions.clear()
+    server._responses.clear()
+
+
+LOGIN = {"username": "test@example.com", "password": "testpass", "days": 2}
+
+
+class TestIndexPage:
+    """Test suite for serving the web UI page."""
+
+    def test_index_gzip(self):
+        """Test that the page is served precompressed when gzip is accepted."""
+        client = TestClient(app)
+        response = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-type"].startswith("text/html")
+        assert "<!DOCTYPE html>" in response.text
+
+    def test_index_identity(self):
+        """Test that clients refusing gzip get the plain page."""
+        client = TestClient(app)
+        response = client.get("/", headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert "<!DOCTYPE html>" in response.text
+
+    def test_index_not_modified(self):
+        """Test that a matching ETag returns 304 with no body."""
+        client = TestClient(app)
+        etag = client.get("/").headers["etag"]
+
+        response = client.get("/", headers={"If-None-Match": etag})
+
+        assert etag.startswith('W/"')
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_app_script(self):
+        """Test that the page links a versioned script that can be cached forever."""
+        client = TestClient(app)
+        page = client.get("/").text
+        src = page.split('<script defer src="')[-1].split('"')[0]
+
+        assert src.startswith("/static/app.js?v=")
+        response = client.get(src)
+        assert response.status_code == 200
+        assert "createApp" in response.text
+        assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+
+
+class TestMeterData:
+    """Test suite for the meter data endpoint."""
+
+    def test_meter_data(self, mock_api):
+        """Test statistics in the meter data response."""
+        client = TestClient(app)
+        response = client.post("/api/meter-data", json=LOGIN)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["meter_serial"] == "METER123"
+        # The range ends on the last half-hour mark
+        assert data["end_date"][-5:] in ("00:00", "30:00")
+        assert data["total_kwh"] == pytest.approx(95 * 0.5 + 2.5)
+        assert data["avg_daily"] == pytest.approx((95 * 0.5 + 2.5) / 2)
+        assert data["peak_kwh"] == 2.5
+        assert data["peak_time"] == "2024-01-02T06:00:00+00:00"
+        assert data["interval_count"] == 96
+        assert data["days"] == [["2024-01-01", 24.0, 0, 48], ["2024-01-02", 26.0, 48, 48]]
+        assert data["times"][60] == "06:00"
+        values = array("f", base64.b64decode(data["values_f32"]))
+        assert len(values) == 96
+        assert values[60] == 2.5
+
+    def test_meter_data_gzip(self, mock_api):
+        """Test that the meter data response is gzip compressed on the wire."""
+        client = TestClient(app)
+        response = client.post(
+            "/api/meter-data", json=LOGIN, headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["interval_count"] == 96
+
+    def test_meter_data_not_modified(self, mock_api):
+        """Test that a matching If-None-Match returns 304 with no body."""
+        client = TestClient(app)
+        first = client.post("/api/meter-data", json=LOGIN)
+        etag = first.headers["etag"]
+
+        second = client.post("/api/meter-data", json=LOGIN, headers={"If-None-Match": etag})
+        changed = client.post(
+            "/api/meter-data", json=LOGIN, headers={"If-None-Match": '"stale"'}
+        )
+
+        assert etag.startswith('W/"')
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+        assert changed.status_code == 200
+        assert changed.headers["etag"] == etag
+
+    def test_meter_data_not_modified_weak_match(self, mock_api):
+        """Test that If-None-Match lists, strong forms and * match weakly."""
+        client = TestClient(app)
+        etag = client.post("/api/meter-data", json=LOGIN).headers["etag"]
+        strong = etag.removeprefix("W/")
+
+        for if_none_match in (strong, f'"stale", {etag}', f'"stale",{strong}', "*"):
+            response = client.post(
+                "/api/meter-data", json=LOGIN, headers={"If-None-Match": if_none_match}
+            )
+            assert response.status_code == 304, if_none_match
+
+    def test_session_reused(self, mock_api):
+        """Test that repeat requests skip login, account and meter lookups."""
+        client = TestClient(app)
+        first = client.post("/api/meter-data", json=LOGIN)
+        second = client.post("/api/meter-data", json=LOGIN)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert mock_api.login.call_count == 1
+        assert mock_api.get_account_numbers.call_count == 1
+        assert mock_api.get_meters.call_count == 1
+
+    def test_response_cached(self, mock_api):
+        """Test that repeat requests for the same range reuse the response."""
+        client = TestClient(app)
+        first = client.post("/api/meter-data", json=LOGIN)
+        second = client.post("/api/meter-data", json=LOGIN)
+        other_range = client.post("/api/meter-data", json={**LOGIN, "days": 7})
+
+        assert second.json() == first.json()
+        assert other_range.status_code == 200
+        assert mock_api.get_consumption_data.call_count == 2
+
+    def test_cached_response_skips_login(self, mock_api):
+        """Test that a cached response is served without checking the session."""
+        mock_api.token_expires = int(time.time())
+
+        client = TestClient(app)
+        first = client.post("/api/meter-data", json=LOGIN)
+        second = client.post("/api/meter-data", json=LOGIN)
+        other_password = client.post("/api/meter-data", json={**LOGIN, "password": "other"})
+
+        assert second.json() == first.json()
+        assert other_password.status_code == 200
+        assert mock_api.login.call_count == 2
+        assert mock_api.get_consumption_data.call_count == 2
+
+    def test_response_cache_expires(self, mock_api, monkeypatch):
+        """Test that cached responses are rebuilt after the TTL."""
+        client = TestClient(app)
+        client.post("/api/meter-data", json=LOGIN)
+        monkeypatch.setattr(server, "RESPONSE_CACHE_TTL", 0)
+        client.post("/api/meter-data", json=LOGIN)
+
+        assert mock_api.get_consumption_data.call_count == 2
+
+    def test_expired_session_skips_lookups(self, mock_api):
+        """Test that logging in again reuses the known account and meters."""
+        mock_api.token_expires = int(time.time())
+
+        client = TestClient(app)
+        first = client.post("/api/meter-data", json=LOGIN)
+        second = client.post("/api/meter-data", json={**LOGIN, "days": 7})
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert mock_api.login.call_count == 2
+        assert mock_api.get_account_numbers.call_count == 1
+        assert mock_api.get_meters.call_count == 1
+
+    def test_concurrent_requests_share_fetch(self, mock_api, sample_consumption_data):
+        """Test that simultaneous requests for one user log in and fetch once."""
+        async def slow_fetch(**kwargs):
+            await asyncio.sleep(0.05)
+            return sample_consumption_data
+
+        mock_api.get_consumption_data.side_effect = slow_fetch
+
+        async def fetch_twice():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(
+                    client.post("/api/meter-data", json=LOGIN),
+                    client.post("/api/meter-data", json=LOGIN),
+                )
+
+        first, second = asyncio.run(fetch_twice())
+
+        assert first.status_code == 200
+        assert second.json() == first.json()
+        assert mock_api.login.call_count == 1
+        assert mock_api.get_consumption_data.call_count == 1
+
+    def test_sessions_share_http_client(self, mock_api):
+        """Test that sessions use the app's pooled HTTP client while it runs."""
+        with patch("eonapi.server.EonNextAPI", return_value=mock_api) as api_class:
+            with TestClient(app) as client:
+                client.post("/api/meter-data", json=LOGIN)
+                client.post("/api/meter-data", json={**LOGIN, "password": "other"})
+                shared = app.state.http_client
+
+            clients = [call.kwargs["client"] for call in api_class.call_args_list]
+
+        assert isinstance(shared, httpx.AsyncClient)
+        assert clients == [shared, shared]
+        assert shared.is_closed
+        assert not server._sessions
+
+    def test_session_not_shared_across_passwords(self, mock_api):
+        """Test that a different password always logs in again."""
+        client = TestClient(app)
+        client.post("/api/meter-data", json=LOGIN)
+        client.post("/api/meter-data", json={**LOGIN, "password": "other"})
+
+        assert mock_api.login.call_count == 2
+
+    def test_login_failure(self, mock_api):
+        """Test that rejected credentials return 401 and aren't cached."""
+        mock_api.login.return_value = False
+
+        client = TestClient(app)
+        response = client.post("/api/meter-data", json=LOGIN)
+
+        assert response.status_code == 401
+        assert not server._sessions
@@ -0,0 +1,80 @@
+"""Tests for the stats module."""
+
+from eonapi.stats import columns_by_day, summarize
+
+
+class TestSummarize:
+    """Test suite for summarize()."""
+
+    def test_totals_and_peak(self):
+        """Test total and peak with string and float values."""
+        records = [
+            {"startAt": "2024-01-01T00:00:00+00:00", "value": "0.5"},
+            {"startAt": "2024-01-01T00:30:00+00:00", "value": 2.0},
+            {"startAt": "2024-01-01T01:00:00+00:00", "value": "1.5"},
+        ]
+
+        assert summarize(records) == (4.0, 2.0, "2024-01-01T00:30:00+00:00")
+
+    def test_peak_ties_keep_earliest(self):
+        """Test that the first of several equal peaks is reported."""
+        records = [
+            {"startAt": "2024-01-01T00:00:00+00:00", "value": 1.0},
+            {"startAt": "2024-01-01T00:30:00+00:00", "value": 1.0},
+        ]
+
+        assert summarize(records)[2] == "2024-01-01T00:00:00+00:00"
+
+    def test_empty(self):
+        """Test that no records give zero totals and no peak time."""
+        assert summarize([]) == (0.0, 0.0, "")
+
+
+class TestColumnsByDay:
+    """Test suite for columns_by_day()."""
+
+    def test_columns_by_local_date(self):
+        """Test that records are ordered and split by the date in their own offset."""
+        records = [
+            {"startAt": "2024-06-02T00:30:00+01:00", "value": 2},
+            {"startAt": "2024-06-01T23:30:00+01:00", "value": "0.5"},
+            {"startAt": "2024-06-02T00:00:00+01:00", "value": 1.5},
+        ]
+
+        start_ats, values, days = columns_by_day(records)
+
+        assert start_ats == [
+            "2024-06-01T23:30:00+01:00",
+            "2024-06-02T00:00:00+01:00",
+            "2024-06-02T00:30:00+01:00",
+        ]
+        assert values == [0.5, 1.5, 2.0]
+        assert days == [("2024-06-01", 0.5, 0, 1), ("2024-06-02", 3.5, 1, 2)]
+
+    def test_clock_change_order(self):
+        """Test that the repeated hour when clocks go back stays in time order."""
+        records = [
+            {"startAt": "2024-10-27T01:00:00+00:00", "value": 2},
+            {"startAt": "2024-10-27T01:00:00+01:00", "value": 1},
+        ]
+
+        start_ats, values, days = columns_by_day(records)
+
+        assert values == [1.0, 2.0]
+        assert days == [("2024-10-27", 3.0, 0, 2)]
+
+    def test_z_suffix(self):
+        """Test that UTC timestamps written with a Z suffix are ordered too."""
+        records = [
+            {"startAt": "2024-01-01T00:30:00Z", "value": 2},
+            {"startAt": "2024-01-01T00:00:00+00:00", "value": 1},
+        ]
+
+        start_ats, values, days = columns_by_day(records)
+
+        assert start_ats == ["2024-01-01T00:00:00+00:00", "2024-01-01T00:30:00Z"]
+        assert days == [("2024-01-01", 3.0, 0, 2)]
+
+    def test_empty(self):
+        """Test that no records give empty columns."""
+        assert columns_by_day([]) == ([], [], [])